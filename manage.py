@@ -6,12 +6,8 @@ import sys
 
 
 if __name__ == "__main__":
-    try:
-        command = sys.argv[1]
-    except IndexError:
-        command = None
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
-    if command == "testsuite":
+    if len(sys.argv) > 1 and sys.argv[1] == "testsuite":
         import django
         from django.conf import settings
         from django.test.utils import get_runner
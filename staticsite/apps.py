@@ -24,6 +24,9 @@ class StaticSiteConfig(AppConfig):
         This also adds new attributes to the URLPattern objects to store the required data for static site generation.
         """
 
+        # Bind the original _path once rather than looking it up on every path() call
+        _path = conf._path
+
         def _staticsite_path(
             route: str,
             view: FunctionType,
@@ -35,49 +38,44 @@ class StaticSiteConfig(AppConfig):
             staticsite_status_codes: tuple[int] | None = None,
             Pattern: RegexPattern | RoutePattern | None = None,
         ) -> URLResolver | URLPattern:
-            pattern_or_resolver = conf._path(route, view, kwargs, name, Pattern=Pattern)
-            if staticsite_path and isinstance(
+            pattern_or_resolver = _path(route, view, kwargs, name, Pattern=Pattern)
+            # Most paths are not static site paths, return them without any further checks
+            if not staticsite_path or not isinstance(
                 pattern_or_resolver, resolvers.URLPattern
             ):
-                if staticsite_urls_generator is None:
-                    staticsite_urls_generator = null_generator
-                if staticsite_status_codes is None:
-                    staticsite_status_codes = (200,)
-                if not callable(staticsite_urls_generator):
-                    raise ImproperlyConfigured(
-                        'When registering a static site path the URLs generator argument "staticsite_urls_generator" must be None or a callable'
-                    )
-                if name is None:
-                    raise ImproperlyConfigured(
-                        'When registering a static site path the "name" argument must be provided'
-                    )
-                if staticsite_filename is not None and not isinstance(
-                    staticsite_filename, str
-                ):  # moo
-                    raise ImproperlyConfigured(
-                        'When registering a static site path the "staticsite_filename" argument must None or a string'
-                    )
-                if not all(
-                    isinstance(status_code, int)
-                    for status_code in staticsite_status_codes
-                ):
-                    raise ImproperlyConfigured(
-                        'When registering a static site path the "staticsite_status_codes" argument must None or an iterable of integers'
-                    )
-                # resolvers.URLPattern needs some additional attributes to store the staticsite details
-                setattr(pattern_or_resolver, "is_static", True)
-                setattr(pattern_or_resolver, "staticsite_namespace", None)
-                setattr(
-                    pattern_or_resolver,
-                    "staticsite_urls_generator",
-                    staticsite_urls_generator,
+                return pattern_or_resolver
+            if staticsite_urls_generator is None:
+                staticsite_urls_generator = null_generator
+            if staticsite_status_codes is None:
+                staticsite_status_codes = (200,)
+            if not callable(staticsite_urls_generator):
+                raise ImproperlyConfigured(
+                    'When registering a static site path the URLs generator argument "staticsite_urls_generator" must be None or a callable'
+                )
+            if name is None:
+                raise ImproperlyConfigured(
+                    'When registering a static site path the "name" argument must be provided'
                 )
-                setattr(pattern_or_resolver, "staticsite_filename", staticsite_filename)
-                setattr(
-                    pattern_or_resolver,
-                    "staticsite_status_codes",
-                    staticsite_status_codes,
+            if staticsite_filename is not None and not isinstance(
+                staticsite_filename, str
+            ):
+                raise ImproperlyConfigured(
+                    'When registering a static site path the "staticsite_filename" argument must None or a string'
+                )
+            if not all(
+                isinstance(status_code, int) for status_code in staticsite_status_codes
+            ):
+                raise ImproperlyConfigured(
+                    'When registering a static site path the "staticsite_status_codes" argument must None or an iterable of integers'
                 )
+            # resolvers.URLPattern needs some additional attributes to store the staticsite details
+            pattern_or_resolver.__dict__.update(
+                is_static=True,
+                staticsite_namespace=None,
+                staticsite_urls_generator=staticsite_urls_generator,
+                staticsite_filename=staticsite_filename,
+                staticsite_status_codes=staticsite_status_codes,
+            )
             return pattern_or_resolver
 
         urls.conf.path = partial(_staticsite_path, Pattern=RoutePattern)
@@ -89,8 +87,7 @@ class StaticSiteConfig(AppConfig):
         Iterate all loaded URLs and store any URLs defined as a staticsite path.
         """
 
-        for pattern, namespace, _ in iter_url_patterns():
-            if getattr(pattern, "is_static", False):
-                # Make sure the staticsite path knows its namespace
-                pattern.staticsite_namespace = namespace
-                add_staticsite_url(pattern)
+        for pattern, namespace, _ in iter_url_patterns(static_only=True):
+            # Make sure the staticsite path knows its namespace
+            pattern.staticsite_namespace = namespace
+            add_staticsite_url(pattern)
@@ -1,24 +1,69 @@
-import tempfile
-from shutil import rmtree
 from logging import getLogger
 from pathlib import Path
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.core.management import call_command
-from staticsite.renderer import StaticSiteRenderer, render_redirects
-from staticsite.static import copy_static_and_media_files
+from staticsite.renderer import (
+    StaticSiteRenderer,
+    render_redirects,
+    iter_render_redirects,
+)
+from staticsite.static import (
+    copy_static_and_media_files,
+    iter_copy_static_and_media_files,
+)
 from staticsite.publisher import (
     get_publishing_targets,
     get_publishing_target,
     get_publisher_from_options,
 )
-from staticsite.utils import create_test_file
+from staticsite.utils import (
+    create_test_file,
+    fast_rmtree,
+    fast_temporary_directory,
+)
 from staticsite.errors import StaticSiteError
 
 
 log = getLogger("main")
 
 
+HELP_TEXT = "\n".join(
+    (
+        "",
+        "This help message:",
+        "    ./manage.py staticsite help",
+        "",
+        "Generate a local static site:",
+        "    ./manage.py staticsite generate --output-directory=<directory_name>",
+        "",
+        'Generate a static site and publish it to remote object storage backend ("target_name" defaults to "default"):',
+        "    ./manage.py staticsite publish --target=<target_name>",
+        "",
+        'Test a publish target is configured correctly ("target_name" defaults to "default"):',
+        "    ./manage.py staticsite test-target --target=<target_name>",
+        "",
+        "List all URL routes in the project that have been defined as static:",
+        "    ./manage.py staticsite list-static-urls",
+        "",
+        "List all defined publish targets:",
+        "    ./manage.py staticsite list-publish-targets",
+        "",
+        "Additional options:",
+        "",
+        '    --collectstatic - when generating a local static site, also run "collectstatic"',
+        "    --quiet - no log output",
+        '    --force - automatically answer "yes" to all questions',
+        "    --exclude-staticfiles - when generating a local static site, exclude static files",
+        "    --generate-redirects - create static HTML redirect pages for any 301 or 303 redirects",
+        "    --parallel-render=N - number of parallel processes to use when rendering the site, defaults to 1",
+        "    --parallel-upload=N - number of parallel uploads to use when publishing the site, defaults to the target's PUBLISH_CONCURRENCY option or 1",
+        "",
+        "",
+    )
+)
+
+
 def ask_question(question="Type 'yes' to continue, or 'no' to cancel: "):
     return input(question).lower() == "yes"
 
@@ -39,11 +84,22 @@ def load_target(target_name):
         publisher = get_publisher_from_options(target_options)
     except Exception as e:
         raise CommandError(f"Failed to load backend '{target_name}': {e}") from e
-    return target_options, publisher
+    return target_options, publisher.backend_class
 
 
 class Command(BaseCommand):
     help = "Generates a local static site"
+    # Subcommands which can be run, each maps to a command_<name> method with hyphens replaced by underscores
+    SUBCOMMANDS = frozenset(
+        (
+            "help",
+            "generate",
+            "publish",
+            "test-target",
+            "list-static-urls",
+            "list-publish-targets",
+        )
+    )
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -69,82 +125,30 @@ class Command(BaseCommand):
         parser.add_argument(
             "--parallel-render", dest="parallel_render", type=int, default=1
         )
+        parser.add_argument(
+            "--parallel-upload", dest="parallel_upload", type=int, default=None
+        )
 
     def write(self, msg, error=False):
-        if not self.quiet:
-            if error:
-                self.stderr.write(msg)
-            else:
-                self.stdout.write(msg)
+        if self.quiet:
+            return
+        if error:
+            self.stderr.write(msg)
+        else:
+            self.stdout.write(msg)
 
     def handle(self, *args, **options):
-        subcommand_map = {
-            "help": self.command_help,
-            "generate": self.command_generate,
-            "publish": self.command_publish,
-            "test-target": self.command_test_target,
-            "list-static-urls": self.command_list_static_urls,
-            "list-publish-targets": self.command_list_publish_targets,
-        }
-        subcommand_name = options.get("subcommand")
+        subcommand_name = options.get("subcommand") or "help"
         self.quiet = options.get("quiet")
-        if subcommand_name is None:
-            subcommand_func = self.command_help
-        else:
-            subcommand_func = subcommand_map.get(subcommand_name)
-        if subcommand_func:
-            subcommand_func(*args, **options)
-        else:
+        if subcommand_name not in self.SUBCOMMANDS:
             raise CommandError(
                 f'Unknown subcommand specified: {subcommand_name} (try "help")'
             )
+        subcommand_func = getattr(self, f"command_{subcommand_name.replace('-', '_')}")
+        subcommand_func(*args, **options)
 
     def command_help(self, *args, **options):
-        self.write(self.help)
-        self.write("")
-        self.write("This help message:")
-        self.write("    ./manage.py staticsite help")
-        self.write("")
-        self.write("Generate a local static site:")
-        self.write(
-            "    ./manage.py staticsite generate --output-directory=<directory_name>"
-        )
-        self.write("")
-        self.write(
-            'Generate a static site and publish it to remote object storage backend ("target_name" defaults to "default"):'
-        )
-        self.write("    ./manage.py staticsite publish --target=<target_name>")
-        self.write("")
-        self.write(
-            'Test a publish target is configured correctly ("target_name" defaults to "default"):'
-        )
-        self.write("    ./manage.py staticsite test-target --target=<target_name>")
-        self.write("")
-        self.write(
-            "List all URL routes in the project that have been defined as static:"
-        )
-        self.write("    ./manage.py staticsite list-static-urls")
-        self.write("")
-        self.write("List all defined publish targets:")
-        self.write("    ./manage.py staticsite list-publish-targets")
-        self.write("")
-        self.write("Additional options:")
-        self.write("")
-        self.write(
-            '    --collectstatic - when generating a local static site, also run "collectstatic"'
-        )
-        self.write("    --quiet - no log output")
-        self.write('    --force - automatically answer "yes" to all questions')
-        self.write(
-            "    --exclude-staticfiles - when generating a local static site, exclude static files"
-        )
-        self.write(
-            "    --generate-redirects - create static HTML redirect pages for any 301 or 303 redirects"
-        )
-        self.write(
-            "    --parallel-render=N - number of parallel processes to use when rendering the site, defaults to 1"
-        )
-        self.write("")
+        self.write(f"{self.help}\n{HELP_TEXT}")
 
     def command_generate(self, *args, **options):
         output_directory = options.get("output_directory")
@@ -180,7 +184,7 @@ class Command(BaseCommand):
             self.write("")
             if force or ask_question():
                 self.write("Recreating output directory ...")
-                rmtree(output_directory)
+                fast_rmtree(output_directory)
                 output_directory.mkdir(parents=True)
             else:
                 raise CommandError("Static site generation cancelled.")
@@ -216,6 +220,7 @@ class Command(BaseCommand):
         exclude_staticfiles = options.get("exclude_staticfiles")
         generate_redirects = options.get("generate_redirects")
         parallel_render = options.get("parallel_render")
+        parallel_upload = options.get("parallel_upload")
         if collectstatic:
             self.write('Running "collectstatic" ...')
             run_collectstatic()
@@ -230,34 +235,44 @@ class Command(BaseCommand):
         self.write(f"    Public URL:   {target_options.get('PUBLIC_URL')}")
         self.write("")
         self.write(
-            "The static site will first be generated locally into a temporary directory"
+            "The static site will be generated locally into a temporary directory and"
         )
         self.write(
-            "before being uploaded to the publishing target. Once uploaded and verified"
+            "uploaded to the publishing target as it is generated. Once uploaded and"
         )
-        self.write("the temporary directory will be deleted.")
+        self.write("verified the temporary directory will be deleted.")
         self.write("")
         if options.get("force") or ask_question():
             self.write("Publishing static site ...")
-            with tempfile.TemporaryDirectory() as tmpdirname:
-                tmpdirpath = Path(tmpdirname)
-                self.write(
-                    f"Generating static site into temporary directory: {tmpdirpath}"
-                )
-                with StaticSiteRenderer(
-                    concurrency=parallel_render
-                ) as staticsite_renderer:
-                    staticsite_renderer.render_to_directory(tmpdirpath)
-                if not exclude_staticfiles:
-                    copy_static_and_media_files(tmpdirpath)
-                if generate_redirects:
-                    self.write("Generating redirects ...")
-                    render_redirects(tmpdirpath)
+            with fast_temporary_directory() as tmpdirpath:
+
+                def generate_files():
+                    # Files are yielded as they are written so they can be uploaded while the rest of the site
+                    # is generated, every generated file is yielded so the directory does not need indexing
+                    self.write(
+                        f"Generating static site into temporary directory: {tmpdirpath}"
+                    )
+                    with StaticSiteRenderer(
+                        concurrency=parallel_render
+                    ) as staticsite_renderer:
+                        yield from staticsite_renderer.iter_render_to_directory(
+                            tmpdirpath
+                        )
+                    if not exclude_staticfiles:
+                        yield from iter_copy_static_and_media_files(tmpdirpath)
+                    if generate_redirects:
+                        self.write("Generating redirects ...")
+                        yield from iter_render_redirects(tmpdirpath)
+
                 self.write("Authenticating to publishing target ...")
                 publisher = publisher_class(tmpdirpath, target_options)
                 publisher.authenticate()
                 self.write("Publishing static site to target ...")
-                publisher.publish()
+                publisher.publish(
+                    concurrency=parallel_upload,
+                    files=generate_files(),
+                    index_local=False,
+                )
             self.write("Publishing static site complete.")
         else:
             self.write("Publishing static site cancelled.")
@@ -282,8 +297,9 @@ class Command(BaseCommand):
             self.write("Testing publishing target...")
             test_file = create_test_file()
             publisher = publisher_class(test_file.parent, target_options)
+            publisher.authenticate()
             self.write(f"Test file created: {test_file}")
-            remote_url = publisher.remote_url(test_file)
+            remote_url = publisher.generate_remote_url(test_file)
             self.write(f"Testing URL: {remote_url}")
             self.write("Uploading test file...")
             publisher.upload_test_file(test_file)
@@ -1,36 +1,118 @@
 import os
+import json
 import warnings
 from sys import stderr
 from logging import getLogger
-from binascii import hexlify
 from types import ModuleType, FunctionType
+from collections.abc import Iterable
 from importlib import import_module
 from pathlib import Path
 from hashlib import md5
-from mimetypes import guess_file_type
+from mimetypes import init as mimetypes_init
+from threading import local
+from time import time_ns
+from itertools import count
 from urllib.parse import urlsplit, urlunsplit
-from http.client import HTTPConnection, HTTPSConnection
-from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPSConnection, HTTPResponse, HTTPException
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from .errors import StaticSitePublishError
-from .static import filter_static_dirs
+from .static import filter_static_dirs, get_ignored_static_dirs
+
+
+try:
+    from hashlib import file_digest
+except ImportError:
+    # hashlib.file_digest() was added in Python 3.11
+    def file_digest(fileobj, digest, chunk: int = 1048576):
+        digest = digest()
+        while data := fileobj.read(chunk):
+            digest.update(data)
+        return digest
+
+
+try:
+    from mimetypes import guess_file_type
+except ImportError:
+    # mimetypes.guess_file_type() was added in Python 3.13, guess_type() accepts file paths before then
+    from mimetypes import guess_type as guess_file_type
+
+
+try:
+    from xxhash import xxh3_128 as content_id_digest
+except ImportError:
+    # xxhash is optional, without it the md5 hash needed for comparing with remote files is also used as the content
+    # ID so changed files are only hashed once
+    content_id_digest = md5
 
 
 log = getLogger("main")
+_cache_buster_counter = count()
+# Mimetypes for the file extensions which make up most static sites, looked up directly before falling back to the
+# mimetypes module. This also keeps these mimetypes the same regardless of the system mime.types files
+COMMON_MIMETYPES = {
+    ".html": "text/html",
+    ".htm": "text/html",
+    ".css": "text/css",
+    ".js": "text/javascript",
+    ".mjs": "text/javascript",
+    ".json": "application/json",
+    ".xml": "application/xml",
+    ".txt": "text/plain",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".avif": "image/avif",
+    ".ico": "image/vnd.microsoft.icon",
+    ".woff": "font/woff",
+    ".woff2": "font/woff2",
+}
+# Load the system mime.types files once at import rather than lazily on the first upload
+mimetypes_init()
+
+
+@lru_cache(maxsize=512)
+def _mime_for_ext(ext: str) -> str | None:
+    """Returns the mimetype for a lowercase file extension, or None if it is unknown. Sites contain many files
+    but only a handful of distinct extensions, so each extension is only looked up once."""
+    mimetype = COMMON_MIMETYPES.get(ext)
+    if mimetype is not None:
+        return mimetype
+    return guess_file_type(f"file{ext}")[0] if ext else None
 
 
 def check_publisher_dependencies(
-    required_by: str, module_name: str, package_name: str = None
-) -> ModuleType:
+    required_by: str, module_name: str, attribute_name: str | None = None
+) -> ModuleType | object:
+    """Import and return a module required by a publisher, or an attribute of it if attribute_name is set."""
     try:
-        return import_module(module_name, package_name)
+        module = import_module(module_name)
     except ImportError:
         stderr.write(
             f'Static site backend "{required_by}" requires module "{module_name}" to be installed'
         )
         raise
+    if attribute_name is None:
+        return module
+    try:
+        return getattr(module, attribute_name)
+    except AttributeError as e:
+        stderr.write(
+            f'Static site backend "{required_by}" requires "{module_name}.{attribute_name}" which was not found'
+        )
+        raise ImportError(
+            f'cannot import name "{attribute_name}" from "{module_name}"'
+        ) from e
 
 
+@lru_cache
 def get_publisher(engine_name: str) -> ModuleType:
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
@@ -52,10 +134,17 @@ def get_publisher_from_options(options: dict) -> ModuleType:
     return get_publisher(engine_name)
 
 
+@lru_cache(maxsize=1)
 def get_publishing_targets() -> dict:
     return getattr(settings, "STATICSITE_PUBLISHING_TARGETS", {})
 
 
+@receiver(setting_changed)
+def clear_publishing_targets_cache(*, setting: str, **kwargs) -> None:
+    if setting == "STATICSITE_PUBLISHING_TARGETS":
+        get_publishing_targets.cache_clear()
+
+
 def get_publishing_target(target_name: str) -> dict:
     try:
         return get_publishing_targets()[target_name]
@@ -66,11 +155,44 @@ def get_publishing_target(target_name: str) -> dict:
         )
 
 
+class PublisherState(object):
+    """Connection and remote file state for a publisher backend. Slotted so lookups made for every file are plain
+    attribute loads, and a misspelt name raises an AttributeError rather than silently creating a new key."""
+
+    __slots__ = (
+        "connection",
+        "bucket",
+        "transfer",
+        "transfer_futures",
+        "uploads_to_check",
+        "container_prefix",
+        "predefined_acl",
+        "remote_etags",
+        "remote_md5",
+        "remote_crc32c",
+        "remote_sizes",
+    )
+
+    def __init__(self) -> None:
+        self.connection = None
+        self.bucket = None
+        self.transfer = None
+        self.transfer_futures = []
+        self.uploads_to_check = []
+        self.container_prefix = ""
+        self.predefined_acl = None
+        self.remote_etags = {}
+        self.remote_md5 = {}
+        self.remote_crc32c = {}
+        self.remote_sizes = {}
+
+
 class PublisherBackendBase(object):
     """Generic base class for all backends, mostly an interface / template."""
 
     REQUIRED_OPTIONS = ("PUBLIC_URL",)
     HTTP_TIMEOUT = 10
+    PUBLISH_QUEUE_SIZE = 256
 
     def __init__(self, source_dir: Path | str, options: dict) -> None:
         if isinstance(source_dir, str):
@@ -85,11 +207,26 @@ class PublisherBackendBase(object):
             )
         self.source_dir = source_dir
         self.options = options
-        self.local_files = set()
-        self.local_dirs = set()
+        self.local_files = []
+        self.local_dirs = []
         self.remote_files = set()
+        self.local_file_hashes = {}
+        self.hash_manifest = None
+        self.hash_manifest_updates = {}
+        self._remote_paths = {}
         self.remote_url_parts = urlsplit(options.get("PUBLIC_URL", ""))
-        self.d = {}
+        # Remote paths always start with a /, so the URL prefix is built once without a trailing /
+        self._url_prefix = urlunsplit(
+            (
+                self.remote_url_parts.scheme,
+                self.remote_url_parts.netloc,
+                self.remote_url_parts.path.rstrip("/"),
+                "",
+                "",
+            )
+        )
+        self.state = PublisherState()
+        self._http_connections = local()
         self._authenticated = False
         self.validate_options()
 
@@ -102,38 +239,108 @@ class PublisherBackendBase(object):
                 )
 
     def index_local_files(self) -> None:
-        for root, dirs, files in self.source_dir.walk():
-            dirs[:] = filter_static_dirs(dirs)
+        """Indexes the files and directories in the source directory as str paths. Sites can contain a very large
+        number of files so no Path objects are created here, and os.scandir() reads the entry type from the
+        directory listing without a stat() call per entry."""
+        local_files = []
+        local_dirs = []
+        ignore_dirs = get_ignored_static_dirs()
+        to_scan = [str(self.source_dir)]
+        while to_scan:
+            dirs = []
+            with os.scandir(to_scan.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry)
+                    else:
+                        local_files.append(entry.path)
+            dir_names = set(filter_static_dirs([d.name for d in dirs], ignore_dirs))
             for d in dirs:
-                self.local_dirs.add(root / d)
-            for f in files:
-                self.local_files.add(root / f)
+                if d.name in dir_names:
+                    local_dirs.append(d.path)
+                    to_scan.append(d.path)
+        self.local_files = local_files
+        self.local_dirs = local_dirs
 
     def get_local_file_hash(
         self,
         file_path: Path | str,
         digest_func: FunctionType = md5,
-        chunk: int = 1048576,
     ) -> bool | str:
         if not self.file_exists(file_path):
             raise StaticSitePublishError(
                 f"Local static site file does not exist: {file_path}"
             )
-        # md5 is used by Amazon S3 and Google Storage
-        digest = digest_func()
-        with open(file_path, "rb") as f:
-            while True:
-                data = f.read(chunk)
-                if not data:
-                    break
-                digest.update(data)
-        return digest.hexdigest()
-
-    def get_url_hash(
-        self, url: str, digest_func: FunctionType = md5, chunk: int = 1024
-    ) -> bool | str:
-        # CDN cache buster
-        url += "?" + hexlify(os.urandom(16)).decode("utf-8")
+        # md5 is used by Amazon S3 and Google Storage. file_digest() hashes the file in C, releasing the GIL so
+        # files can be hashed in parallel by the upload threads. It reads into its own buffer so the file is
+        # opened unbuffered to avoid copying everything through a second buffer
+        with open(file_path, "rb", buffering=0) as f:
+            return file_digest(f, digest_func).hexdigest()
+
+    def get_cached_local_file_hash(self, file_path: Path | str) -> str:
+        """Returns the md5 hash of a local file. Each file is only read and hashed once, the same hash is used when
+        comparing against the remote file and when verifying the upload."""
+        if isinstance(file_path, str):
+            file_path = Path(file_path)
+        try:
+            return self.local_file_hashes[file_path]
+        except KeyError:
+            if self.hash_manifest is None:
+                local_hash = self.get_local_file_hash(file_path)
+            else:
+                local_hash = self.get_manifest_local_file_hash(file_path)
+            self.local_file_hashes[file_path] = local_hash
+            return local_hash
+
+    def get_manifest_local_file_hash(self, file_path: Path) -> str:
+        """Returns the md5 hash of a local file using the hash manifest from the last publish. Files are identified
+        with a content ID hash, xxhash if it is installed, and the md5 hash is only calculated if the file contents
+        changed."""
+        remote_name = self.remote_path(file_path)
+        content_id = self.get_local_file_hash(file_path, digest_func=content_id_digest)
+        manifest_entry = self.hash_manifest.get(remote_name)
+        if manifest_entry is not None and manifest_entry[0] == content_id:
+            local_hash = manifest_entry[1]
+        elif content_id_digest is md5:
+            local_hash = content_id
+        else:
+            local_hash = self.get_local_file_hash(file_path)
+        self.hash_manifest_updates[remote_name] = [content_id, local_hash]
+        return local_hash
+
+    def load_hash_manifest(self) -> None:
+        """Loads the hash manifest from the file set in the HASH_MANIFEST target option, if it is set. The manifest
+        maps each remote file name to the content ID and md5 hash of the local file it was last published from."""
+        manifest_file = self.options.get("HASH_MANIFEST")
+        if not manifest_file:
+            return
+        try:
+            with open(manifest_file, "rt") as f:
+                self.hash_manifest = json.load(f)
+        except FileNotFoundError:
+            self.hash_manifest = {}
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable hash manifest {manifest_file}: {e}")
+            self.hash_manifest = {}
+
+    def save_hash_manifest(self, remote_names: set[str]) -> None:
+        """Saves the hash manifest entries for the published remote file names."""
+        manifest_file = self.options.get("HASH_MANIFEST")
+        if not manifest_file or self.hash_manifest is None:
+            return
+        manifest = {
+            remote_name: manifest_entry
+            for remote_name, manifest_entry in self.hash_manifest.items()
+            if remote_name in remote_names
+        }
+        manifest.update(self.hash_manifest_updates)
+        with open(manifest_file, "wt") as f:
+            json.dump(manifest, f)
+
+    def http_request(self, method: str, url: str) -> HTTPResponse:
+        """Makes an HTTP request to a URL with a unique CDN cache busting query string, built from the current time
+        and a counter, added. Connections are kept alive and reused for further requests to the same host from the
+        same thread, the response must be fully read before making another request."""
         url_parts = urlsplit(url)
         protocol = url_parts.scheme.strip().lower()
         if protocol == "http":
@@ -142,15 +349,46 @@ class PublisherBackendBase(object):
             http_connector, http_port = HTTPSConnection, 443
         else:
             raise StaticSitePublishError(f'Unsupported URL protocol "{protocol}"')
-        connection = http_connector(url, http_port, self.HTTP_TIMEOUT)
-        connection.request("GET", url_parts.path, headers={"Host": url_parts.netloc})
-        response = connection.getresponse()
+        # CDN cache buster, only needs to be unique so the time plus a counter is used rather than random bytes
+        cache_buster = f"_={time_ns()}-{next(_cache_buster_counter)}"
+        query = f"{url_parts.query}&{cache_buster}" if url_parts.query else cache_buster
+        path = urlunsplit(("", "", url_parts.path or "/", query, ""))
+        connections = self._http_connections.__dict__
+        key = (protocol, url_parts.netloc)
+        for attempt in range(2):
+            connection = connections.get(key)
+            if connection is None:
+                connection = http_connector(
+                    url_parts.hostname,
+                    url_parts.port or http_port,
+                    timeout=self.HTTP_TIMEOUT,
+                )
+                connections[key] = connection
+            try:
+                connection.request(method, path, headers={"Host": url_parts.netloc})
+                return connection.getresponse()
+            except (HTTPException, OSError):
+                # The kept alive connection may have been closed by the server, retry once on a new connection
+                connection.close()
+                del connections[key]
+                if attempt:
+                    raise
+
+    def close_http_connections(self) -> None:
+        """Closes any kept alive HTTP connections opened by the current thread."""
+        connections = self._http_connections.__dict__
+        for connection in connections.values():
+            connection.close()
+        connections.clear()
+
+    def get_url_hash(self, url: str, digest_func: FunctionType = md5) -> bool | str:
+        response = self.http_request("GET", url)
         if response.status == 404:
+            response.read()
             return False
         digest = digest_func()
-        while block := response.read(4096):
-            if block:
-                digest.update(block)
+        while block := response.read(65536):
+            digest.update(block)
         return digest.hexdigest()
 
     def file_exists(self, file_path: Path | str) -> bool:
@@ -168,7 +406,7 @@ class PublisherBackendBase(object):
         if isinstance(local_name, str):
             local_name = Path(local_name)
         try:
-            mimetype = guess_file_type(local_name)[0]
+            mimetype = _mime_for_ext(local_name.suffix.lower())
         except Exception as e:
             raise StaticSitePublishError(
                 f"Failed to guess mimetype for {local_name}: {e}"
@@ -187,24 +425,12 @@ class PublisherBackendBase(object):
                 f'Local static site file "{local_name}" is not '
                 f'in source dir "{self.source_dir}"'
             )
-        remote_path_prefix = self.remote_url_parts.path
-        if remote_path_prefix.startswith("/"):
-            remote_path_prefix = remote_path_prefix[1:]
-        remote_uri = remote_path_prefix + self.remote_path(local_name)
-        return urlunsplit(
-            (
-                self.remote_url_parts.scheme,
-                self.remote_url_parts.netloc,
-                remote_uri,
-                "",
-                "",
-            )
-        )
+        return self._url_prefix + self.remote_path(local_name)
 
-    def get_local_dirs(self) -> set[str]:
+    def get_local_dirs(self) -> list[str]:
         return self.local_dirs
 
-    def get_local_files(self) -> set[str]:
+    def get_local_files(self) -> list[str]:
         return self.local_files
 
     def check_file(self, local_name: Path | None, url: str) -> bool:
@@ -212,7 +438,7 @@ class PublisherBackendBase(object):
             raise StaticSitePublishError(
                 f"Local static site file does not exist: {local_name}"
             )
-        local_hash = self.get_local_file_hash(local_name)
+        local_hash = self.get_cached_local_file_hash(local_name)
         remote_hash = self.get_url_hash(url)
         return local_hash == remote_hash
 
@@ -220,77 +446,157 @@ class PublisherBackendBase(object):
         pass
 
     def remote_path(self, local_name: Path | str) -> str:
-        if isinstance(local_name, str):
-            local_name = Path(local_name)
-        remote_path = Path("/") / local_name.relative_to(self.source_dir)
-        return str(remote_path).replace(os.sep, "/")
+        # Remote paths are needed several times per file when syncing, uploading and verifying, cache them
+        local_path = str(local_name)
+        try:
+            return self._remote_paths[local_path]
+        except KeyError:
+            pass
+        # Slice off the source directory rather than creating a Path when possible
+        source_prefix = f"{self.source_dir}{os.sep}"
+        if local_path.startswith(source_prefix):
+            remote_path = "/" + local_path[len(source_prefix) :]
+        else:
+            remote_path = str(Path("/") / Path(local_path).relative_to(self.source_dir))
+        if os.sep != "/":
+            remote_path = remote_path.replace(os.sep, "/")
+        self._remote_paths[local_path] = remote_path
+        return remote_path
+
+    def publish_concurrency(self) -> int:
+        return int(self.options.get("PUBLISH_CONCURRENCY", 1))
+
+    def upload_and_verify(
+        self, local_name: Path, remote_name: str, verify: bool = True
+    ) -> bool:
+        log.info("Publishing: %s to %s", local_name, remote_name)
+        self.upload_file(local_name, remote_name)
+        if verify:
+            url = self.generate_remote_url(local_name)
+            log.info("Verifying: %s", url)
+            if not self.check_file(local_name, url):
+                raise StaticSitePublishError(f"Remote file failed hash check: {url}")
+        return True
+
+    def bulk_delete(self, remote_names: Iterable[str], max_workers: int = 20) -> bool:
+        """Deletes remote files concurrently. Backends with a batch delete API should override this."""
+
+        def _delete(remote_name: str) -> bool:
+            log.info("Deleting: %s", remote_name)
+            self.delete_remote_file(remote_name)
+            return True
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Consume the results so any exception raised by a delete is raised here
+            list(executor.map(_delete, remote_names))
+        return True
+
+    def upload_test_file(self, local_name: Path | str) -> bool:
+        """Uploads a single file outside of a full publish, used to test a publishing target. Returns once the upload
+        has completed, even for backends which upload asynchronously."""
+        self.upload_file(local_name, self.remote_path(local_name))
+        self.final_checks()
+        return True
+
+    def sync_file(
+        self,
+        local_name: Path | str,
+        remote_name: str,
+        remote_exists: bool,
+        verify: bool,
+    ) -> bool:
+        """Uploads a local file if it is not present remotely or if the remote file differs."""
+        if remote_exists:
+            if self.compare_file(local_name, remote_name):
+                log.debug("File fresh (hash matches): %s", remote_name)
+                return True
+            log.info("File stale (hash different): %s", remote_name)
+        return self.upload_and_verify(local_name, remote_name, verify=verify)
 
     def publish(
         self,
         verify: bool = True,
         ignore_remote_content: bool = False,
-        concurrency: int = 1,
+        concurrency: int | None = None,
+        files: Iterable[Path] | None = None,
+        index_local: bool = True,
     ) -> bool:
-        """Performs a full synchronisation of a local directory olf files with a remote publishing target."""
+        """Performs a full synchronisation of a local directory olf files with a remote publishing target. Uploads
+        and deletes run concurrency at a time, defaulting to the PUBLISH_CONCURRENCY target option. If files is
+        provided, for example a generator yielding files as they are rendered, each file is synced as soon as it is
+        yielded so uploads overlap with producing the files. Once files is exhausted the local directory is indexed
+        and any files not already synced are synced. If files yields every local file, index_local can be set to
+        False to skip indexing the local directory."""
+        if concurrency is None:
+            concurrency = self.publish_concurrency()
         if not self._authenticated:
             raise StaticSitePublishError(
                 "Not authenticated, please call authenticate() before publishing"
             )
-        self.index_local_files()
-        local_files = self.get_local_files()
-        remote_files = set() if ignore_remote_content else self.list_remote_files()
+        remote_files = set() if ignore_remote_content else self.get_remote_files()
+        self.load_hash_manifest()
         local_files_remote_names = set()
-        to_upload = set()
-        to_delete = set()
-        # Check local files to upload
-        for local_file in local_files:
-            remote_file = self.remote_path(local_file)
-            local_files_remote_names.add(remote_file)
-            if remote_file not in remote_files:
-                # Local file is not present remotely, queue it to be uploaded
-                to_upload.add(local_file)
-            else:
-                # File is present remotely, check its hash
-                if not self.compare_file(local_file, remote_file):
-                    log.info(f"File stale (hash different): {remote_file}")
-                    # Remote file hash is different, queue it to be re-uploaded
-                    to_upload.add(local_file)
-                else:
-                    log.debug(f"File fresh (hash matches): {remote_file}")
-        # Check for remote files to delete
-        for remote_file in remote_files:
-            if remote_file not in local_files_remote_names:
-                # Remote file is not present locally, queue it to be deleted
-                to_delete.add(remote_file)
-
-        def _publish_local_file(_local_file: Path) -> bool:
-            _remote_file = self.remote_path(_local_file)
-            log.info(f"Publishing: {_local_file} to {_remote_file}")
-            self.upload_file(_local_file, _remote_file, verify=verify)
-            if verify:
-                url = self.generate_remote_url(_local_file)
-                log.info(f"Verifying: {url}")
-                if not self.check_file(_local_file, url):
-                    raise StaticSitePublishError(
-                        f"Remote file failed hash check: {url}"
-                    )
-            return True
-
-        def _delete_remote_file(_remote_file: str) -> bool:
-            log.info(f"Deleting: {_remote_file}")
-            self.delete_remote_file(_remote_file)
-            return True
-
+        # Limit the number of queued files so a fast producer does not run far ahead of the uploads
+        max_queued = max(self.PUBLISH_QUEUE_SIZE, concurrency)
         with ThreadPoolExecutor(max_workers=concurrency) as executor:
-            # upload any new or changed files
-            executor.map(lambda f: _publish_local_file(f), to_upload)
-            # Call any final checks that may be needed by the backend
-            self.final_checks()
-            # delete any orphan files
-            executor.map(lambda f: _delete_remote_file(f), to_delete)
+            queued = set()
+
+            def _queue(local_file: Path | str) -> None:
+                nonlocal queued
+                remote_file = self.remote_path(local_file)
+                if remote_file in local_files_remote_names:
+                    return
+                local_files_remote_names.add(remote_file)
+                if len(queued) >= max_queued:
+                    done, queued = wait(queued, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                queued.add(
+                    executor.submit(
+                        self.sync_file,
+                        local_file,
+                        remote_file,
+                        remote_file in remote_files,
+                        verify,
+                    )
+                )
 
+            if files is not None:
+                for local_file in files:
+                    _queue(local_file)
+            if files is None or index_local:
+                self.index_local_files()
+                for local_file in self.get_local_files():
+                    _queue(local_file)
+            # Consume the results so any exception raised by a sync is raised here
+            for future in queued:
+                future.result()
+        # Call any final checks that may be needed by the backend
+        self.final_checks()
+        # delete any orphan files, remote files which are not present locally
+        to_delete = remote_files - local_files_remote_names
+        self.bulk_delete(to_delete, max_workers=concurrency)
+        self.save_hash_manifest(local_files_remote_names)
         return True
 
+    async def apublish(
+        self,
+        verify: bool = True,
+        ignore_remote_content: bool = False,
+        concurrency: int | None = None,
+        files: Iterable[Path] | None = None,
+        index_local: bool = True,
+    ) -> bool:
+        """Async version of publish(). The publish runs in a worker thread, with the uploads in their own thread
+        pool as usual, so the calling event loop is not blocked while the site is published."""
+        return await sync_to_async(self.publish, thread_sensitive=False)(
+            verify=verify,
+            ignore_remote_content=ignore_remote_content,
+            concurrency=concurrency,
+            files=files,
+            index_local=index_local,
+        )
+
     def account_username(self) -> str:
         raise NotImplementedError("account_username() must be implemented")
 
@@ -300,8 +606,8 @@ class PublisherBackendBase(object):
     def authenticate(self) -> bool:
         raise NotImplementedError("authenticate() must be implemented")
 
-    def list_remote_files(self) -> set[str]:
-        raise NotImplementedError("list_remote_files() must be implemented")
+    def get_remote_files(self) -> set[str]:
+        raise NotImplementedError("get_remote_files() must be implemented")
 
     def delete_remote_file(self, remote_name: str) -> bool:
         raise NotImplementedError("delete_remote_file() must be implemented")
@@ -309,9 +615,7 @@ class PublisherBackendBase(object):
     def compare_file(self, local_name: Path | str, remote_name: str) -> bool:
         raise NotImplementedError("compare_file() must be implemented")
 
-    def upload_file(
-        self, local_name: Path | str, remote_name: str, verify: bool = True
-    ) -> bool:
+    def upload_file(self, local_name: Path | str, remote_name: str) -> bool:
         raise NotImplementedError("upload_file() must be implemented")
 
     def create_remote_dir(self, remote_dir_name: str) -> bool:
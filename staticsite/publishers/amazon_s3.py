@@ -1,18 +1,38 @@
 from pathlib import Path
+from logging import getLogger
+from collections.abc import Iterable
 from staticsite.publisher import PublisherBackendBase, check_publisher_dependencies
+from staticsite.errors import StaticSitePublishError
+from staticsite.utils import chunked
 
 
 boto3 = check_publisher_dependencies("staticsite.backends.amazon_s3", "boto3")
+transfer = check_publisher_dependencies(
+    "staticsite.backends.amazon_s3", "boto3.s3.transfer"
+)
+botocore_config = check_publisher_dependencies(
+    "staticsite.backends.amazon_s3", "botocore.config"
+)
+
+
+log = getLogger("main")
 
 
 class AmazonS3Backend(PublisherBackendBase):
-    """Publisher for Amazon S3."""
+    """Publisher for Amazon S3. Uploads are submitted to a single shared transfer manager, which reuses its
+    connection pool across all files and uses parallel multipart uploads for files larger than
+    MULTIPART_THRESHOLD bytes. Up to MAX_CONCURRENCY (option, defaults to TRANSFER_CONCURRENCY) transfers run at
+    once. Uploads complete asynchronously and are waited on, and verified, in final_checks()."""
 
     REQUIRED_OPTIONS = ("ENGINE", "PUBLIC_URL", "BUCKET")
+    TRANSFER_CONCURRENCY = 20
+    DELETE_BATCH_SIZE = 1000
+    MULTIPART_THRESHOLD = 8 * 1024 * 1024
+    MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
 
     def get_object(self, name: str) -> dict:
         bucket = self.account_container()
-        return self.d["connection"].head_object(Bucket=bucket, Key=name)
+        return self.state.connection.head_object(Bucket=bucket, Key=name)
 
     def account_username(self) -> str:
         return self.options.get("ACCESS_KEY_ID", "")
@@ -20,6 +40,19 @@ class AmazonS3Backend(PublisherBackendBase):
     def account_container(self) -> str:
         return self.options.get("BUCKET", "")
 
+    def max_concurrency(self) -> int:
+        return int(self.options.get("MAX_CONCURRENCY", self.TRANSFER_CONCURRENCY))
+
+    def create_transfer_manager(self):
+        return transfer.create_transfer_manager(
+            self.state.connection,
+            transfer.TransferConfig(
+                max_concurrency=self.max_concurrency(),
+                multipart_threshold=self.MULTIPART_THRESHOLD,
+                multipart_chunksize=self.MULTIPART_CHUNKSIZE,
+            ),
+        )
+
     def authenticate(
         self,
     ) -> bool:
@@ -27,35 +60,75 @@ class AmazonS3Backend(PublisherBackendBase):
         secret_access_key = self.options.get("SECRET_ACCESS_KEY", "")
         endpoint_url = self.options.get("ENDPOINT_URL", None)
         bucket = self.account_container()
+        max_concurrency = self.max_concurrency()
+        # The default connection pool only has 10 connections, size it so concurrent uploads do not wait on it
+        config = botocore_config.Config(
+            max_pool_connections=max(max_concurrency, 10),
+            retries={"max_attempts": 10, "mode": "adaptive"},
+            tcp_keepalive=True,
+        )
+        session = boto3.session.Session()
         if access_key_id and secret_access_key:
-            self.d["connection"] = boto3.client(
+            self.state.connection = session.client(
                 "s3",
                 aws_access_key_id=access_key_id,
                 aws_secret_access_key=secret_access_key,
                 endpoint_url=endpoint_url,
+                config=config,
             )
         else:
-            self.d["connection"] = boto3.client("s3")
-        self.d["bucket"] = bucket
+            self.state.connection = session.client("s3", config=config)
+        self.state.bucket = bucket
+        self.state.transfer = self.create_transfer_manager()
+        self.state.transfer_futures = []
+        self.state.uploads_to_check = []
         self._authenticated = True
         return True
 
     def get_remote_files(self) -> set[str]:
-        rtn = set()
-        response = self.d["connection"].list_objects_v2(Bucket=self.d["bucket"])
-        if "Contents" in response:
-            for obj in response["Contents"]:
-                rtn.add(obj["Key"])
-        return rtn
+        # list_objects_v2 returns at most 1000 keys per request, page through the whole bucket. The listing
+        # includes each object's ETag and size, keep them so compare_file() does not need a request per file
+        remote_etags = {}
+        remote_sizes = {}
+        paginator = self.state.connection.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.state.bucket):
+            for obj in page.get("Contents", ()):
+                remote_etags[obj["Key"]] = obj["ETag"].strip('"')
+                remote_sizes[obj["Key"]] = obj["Size"]
+        self.state.remote_etags = remote_etags
+        self.state.remote_sizes = remote_sizes
+        return set(remote_etags)
 
     def delete_remote_file(self, remote_name: str):
-        self.d["connection"].delete_object(Bucket=self.d["bucket"], Key=remote_name)
+        self.state.connection.delete_object(Bucket=self.state.bucket, Key=remote_name)
+        return True
+
+    def bulk_delete(self, remote_names: Iterable[str], max_workers: int = 20) -> bool:
+        # delete_objects accepts up to 1000 keys per request
+        for batch in chunked(remote_names, self.DELETE_BATCH_SIZE):
+            log.info("Deleting: %s files", len(batch))
+            response = self.state.connection.delete_objects(
+                Bucket=self.state.bucket,
+                Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True},
+            )
+            errors = response.get("Errors", [])
+            if errors:
+                failed = ", ".join(f"{e.get('Key')} ({e.get('Code')})" for e in errors)
+                raise StaticSitePublishError(f"Failed to delete remote files: {failed}")
         return True
 
     def compare_file(self, local_name: Path | str, remote_name: str) -> bool:
-        obj = self.get_object(remote_name)
-        local_hash = self.get_local_file_hash(local_name)
-        return local_hash == obj["ETag"][1:-1]
+        # Files with different sizes can not match, skip hashing the local file
+        remote_size = self.state.remote_sizes.get(remote_name)
+        if remote_size is not None and remote_size != Path(local_name).stat().st_size:
+            return False
+        remote_etags = self.state.remote_etags
+        if remote_name in remote_etags:
+            remote_hash = remote_etags[remote_name]
+        else:
+            remote_hash = self.get_object(remote_name)["ETag"].strip('"')
+        local_hash = self.get_cached_local_file_hash(local_name)
+        return local_hash == remote_hash
 
     def upload_file(self, local_name: Path | str, remote_name: str) -> bool:
         default_content_type = self.options.get(
@@ -63,9 +136,31 @@ class AmazonS3Backend(PublisherBackendBase):
         )
         content_type = self.detect_local_file_mimetype(local_name, default_content_type)
         extra_args = {"ContentType": content_type}
-        self.d["connection"].upload_file(
-            local_name, self.d["bucket"], remote_name, ExtraArgs=extra_args
+        future = self.state.transfer.upload(
+            str(local_name), self.state.bucket, remote_name, extra_args=extra_args
         )
+        self.state.transfer_futures.append(future)
+        return True
+
+    def check_file(self, local_name: Path | str, url: str) -> bool:
+        # S3 uploads complete asynchronously, queue the check to be run in final_checks()
+        self.state.uploads_to_check.append((local_name, url))
+        return True
+
+    def final_checks(self) -> bool:
+        # Wait for all the queued uploads to complete, result() raises if an upload failed
+        for future in self.state.transfer_futures:
+            future.result()
+        self.state.transfer_futures = []
+        # All uploads are complete, shut down the transfer manager to release its threads. A new, idle, transfer
+        # manager is created in case the backend is used to upload again
+        self.state.transfer.shutdown()
+        self.state.transfer = self.create_transfer_manager()
+        # Verify any completed uploads that were queued to be checked
+        for local_name, url in self.state.uploads_to_check:
+            if not super().check_file(local_name, url):
+                raise StaticSitePublishError(f"Remote file failed hash check: {url}")
+        self.state.uploads_to_check = []
         return True
 
     def create_remote_dir(self, remote_dir_name: str) -> bool:
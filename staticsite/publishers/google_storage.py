@@ -1,23 +1,51 @@
 import os
 from pathlib import Path
+from logging import getLogger
+from time import sleep
+from collections.abc import Iterable
 from staticsite.publisher import PublisherBackendBase, check_publisher_dependencies
 from staticsite.errors import StaticSitePublishError
-from base64 import b64decode
+from staticsite.utils import chunked
+from base64 import b64decode, b64encode
 from binascii import hexlify
 
 
-discovery = check_publisher_dependencies(
-    "staticsite.backends.google_storage", "googleapiclientgoogleapiclient", "discovery"
-)
 storage = check_publisher_dependencies(
-    "staticsite.backends.google_storage", "google.cloud", "storage"
+    "staticsite.backends.google_storage", "google.cloud.storage"
+)
+api_exceptions = check_publisher_dependencies(
+    "staticsite.backends.google_storage", "google.api_core.exceptions"
 )
+google_crc32c = check_publisher_dependencies(
+    "staticsite.backends.google_storage", "google_crc32c"
+)
+
+
+log = getLogger("main")
 
 
 class GoogleCloudStorageBackend(PublisherBackendBase):
-    """Publisher for Google Cloud Storage."""
+    """Publisher for Google Cloud Storage. Uploads are safe to run in parallel, each upload uses its own blob
+    object and failed uploads are retried up to UPLOAD_ATTEMPTS times with an exponential backoff. Local and
+    remote files are compared with CRC32C checksums, which are hardware accelerated by google-crc32c, and fall
+    back to MD5 hashes if only the slow pure Python CRC32C implementation is available."""
 
     REQUIRED_OPTIONS = ("ENGINE", "BUCKET")
+    UPLOAD_ATTEMPTS = 3
+    # Only request the blob fields compare_file() uses when listing the bucket, 1000 is the maximum page size
+    LIST_FIELDS = "items(name,md5Hash,crc32c,size),nextPageToken"
+    LIST_PAGE_SIZE = 1000
+    # Batch requests are limited to 100 calls each
+    DELETE_BATCH_SIZE = 100
+    # Files up to this size are uploaded in a single request, larger files use a resumable upload in chunks
+    SMALL_FILE_SIZE = 8 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+    UPLOAD_BUFFER_SIZE = 1024 * 1024
+    USE_CRC32C = google_crc32c.implementation == "c"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.local_file_crc32c = {}
 
     def account_username(self) -> str:
         return ""
@@ -36,32 +64,117 @@ class GoogleCloudStorageBackend(PublisherBackendBase):
                 )
             os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_file
         bucket = self.account_container()
-        self.d["connection"] = storage.Client()
-        self.d["bucket"] = self.d["connection"].get_bucket(bucket)
+        self.state.connection = storage.Client()
+        self.state.bucket = self.state.connection.get_bucket(bucket)
+        # Buckets with uniform bucket-level access are made public with IAM and reject object ACLs, otherwise each
+        # object is made public with a predefined ACL sent as part of its upload request
+        if self.state.bucket.iam_configuration.uniform_bucket_level_access_enabled:
+            self.state.predefined_acl = None
+        else:
+            self.state.predefined_acl = "publicRead"
         self._authenticated = True
         return True
 
     def get_remote_files(self) -> set[str]:
-        rtn = set()
-        for b in self.d["bucket"].list_blobs():
-            rtn.add(b.name)
-        return rtn
+        # The blob listing includes each blob's checksums and size, keep them so compare_file() does not need a
+        # request per file. The listing is a partial response of only these fields, not the full blob metadata
+        remote_md5 = {}
+        remote_crc32c = {}
+        remote_sizes = {}
+        blobs = self.state.bucket.list_blobs(
+            fields=self.LIST_FIELDS, page_size=self.LIST_PAGE_SIZE
+        )
+        for b in blobs:
+            remote_md5[b.name] = (
+                hexlify(b64decode(b.md5_hash)).decode() if b.md5_hash else ""
+            )
+            remote_crc32c[b.name] = b.crc32c or ""
+            remote_sizes[b.name] = b.size
+        self.state.remote_md5 = remote_md5
+        self.state.remote_crc32c = remote_crc32c
+        self.state.remote_sizes = remote_sizes
+        return set(remote_md5)
+
+    def get_cached_local_file_crc32c(self, file_path: Path | str) -> str:
+        """Returns the base64 encoded CRC32C checksum of a local file, the same format as blob.crc32c. Each file is
+        only read once."""
+        if isinstance(file_path, str):
+            file_path = Path(file_path)
+        try:
+            return self.local_file_crc32c[file_path]
+        except KeyError:
+            checksum = google_crc32c.Checksum()
+            with open(file_path, "rb", buffering=0) as f:
+                while data := f.read(1048576):
+                    checksum.update(data)
+            local_crc32c = b64encode(checksum.digest()).decode()
+            self.local_file_crc32c[file_path] = local_crc32c
+            return local_crc32c
 
     def delete_remote_file(self, remote_name: str) -> str:
-        b = self.d["bucket"].get_blob(remote_name)
-        return b.delete()
+        return self.state.bucket.delete_blob(remote_name)
+
+    def bulk_delete(self, remote_names: Iterable[str], max_workers: int = 20) -> bool:
+        # Batch requests send up to 100 deletes in a single HTTP request
+        for batch in chunked(remote_names, self.DELETE_BATCH_SIZE):
+            log.info("Deleting: %s files", len(batch))
+            try:
+                with self.state.connection.batch():
+                    for remote_name in batch:
+                        self.state.bucket.delete_blob(remote_name)
+            except api_exceptions.GoogleAPIError as e:
+                raise StaticSitePublishError(
+                    f"Failed to delete remote files: {e}"
+                ) from e
+        return True
 
     def compare_file(self, local_name: Path | str, remote_name: str) -> bool:
-        b = self.d["bucket"].get_blob(remote_name)
-        local_hash = self.get_local_file_hash(local_name)
-        remote_hash = str(hexlify(b64decode(b.md5_hash)).decode())
-        return local_hash == remote_hash
+        state = self.state
+        # Files with different sizes can not match, skip hashing the local file
+        remote_size = state.remote_sizes.get(remote_name)
+        if remote_size is not None and remote_size != os.path.getsize(local_name):
+            return False
+        remote_md5 = state.remote_md5.get(remote_name)
+        if remote_md5 is not None:
+            remote_crc32c = state.remote_crc32c[remote_name]
+        else:
+            b = state.bucket.get_blob(remote_name)
+            remote_md5 = hexlify(b64decode(b.md5_hash)).decode() if b.md5_hash else ""
+            remote_crc32c = b.crc32c or ""
+        if self.USE_CRC32C and remote_crc32c:
+            return self.get_cached_local_file_crc32c(local_name) == remote_crc32c
+        if remote_md5:
+            return self.get_cached_local_file_hash(local_name) == remote_md5
+        return False
 
     def upload_file(self, local_name: Path | str, remote_name: str) -> bool:
-        b = self.d["bucket"].blob(remote_name)
-        b.upload_from_filename(local_name)
-        b.make_public()
-        return True
+        file_size = os.path.getsize(local_name)
+        if file_size < self.SMALL_FILE_SIZE:
+            chunk_size = None
+        else:
+            chunk_size = self.UPLOAD_CHUNK_SIZE
+        content_type = self.detect_local_file_mimetype(local_name)
+        for attempt in range(self.UPLOAD_ATTEMPTS):
+            try:
+                b = self.state.bucket.blob(remote_name, chunk_size=chunk_size)
+                # The size and content type are already known so the client does not need to work them out, and
+                # the CRC32C checksum is verified by Google Cloud Storage when the upload completes
+                with open(local_name, "rb", buffering=self.UPLOAD_BUFFER_SIZE) as f:
+                    b.upload_from_file(
+                        f,
+                        size=file_size,
+                        content_type=content_type,
+                        predefined_acl=self.state.predefined_acl,
+                        checksum="crc32c",
+                    )
+                return True
+            except (api_exceptions.GoogleAPIError, ConnectionError) as e:
+                if attempt + 1 >= self.UPLOAD_ATTEMPTS:
+                    raise StaticSitePublishError(
+                        f'Failed to upload "{local_name}" to Google Cloud Storage after {attempt + 1} attempts: {e}'
+                    ) from e
+                log.info("Retrying upload of %s after error: %s", remote_name, e)
+                sleep(2**attempt)
 
     def create_remote_dir(self, remote_dir_name: str) -> bool:
         # not required for Google Storage buckets
@@ -1,31 +1,45 @@
+import os
+import re
 from pathlib import Path
+from logging import getLogger
+from collections.abc import Iterable
 from urllib.parse import urlsplit, urlunsplit, quote_plus
+from concurrent.futures import ThreadPoolExecutor
+from random import uniform
 from time import sleep
 from staticsite.publisher import PublisherBackendBase, check_publisher_dependencies
 from staticsite.errors import StaticSitePublishError
-from binascii import hexlify
+from staticsite.utils import chunked
+from binascii import hexlify, a2b_base64, Error as BinasciiError
 
 
-BlobServiceClient = check_publisher_dependencies(
-    "staticsite.backends.azure_storage", "azure.storage.blob", "BlobServiceClient"
-)
-BlobClient = check_publisher_dependencies(
-    "staticsite.backends.azure_storage", "azure.storage.blob", "BlobClient"
-)
-ContentSettings = check_publisher_dependencies(
-    "staticsite.backends.azure_storage", "azure.storage.blob", "ContentSettings"
+azure_blob = check_publisher_dependencies(
+    "staticsite.backends.azure_storage", "azure.storage.blob"
 )
+BlobServiceClient = azure_blob.BlobServiceClient
+BlobClient = azure_blob.BlobClient
+ContentSettings = azure_blob.ContentSettings
+
+
+log = getLogger("main")
+# Matches the path of a blob URL, blob URLs all have the same https://<account>.blob.core.windows.net/<path> form
+BLOB_URL_PATH = re.compile(r"^https?://[^/]+(/[^?#]*)")
 
 
 class AzureBlobStorateBackend(PublisherBackendBase):
     """Publisher for Azure Blob Storage. Azure static websites in containers are relatively
     slow to make the files available via the public URL. To work around this, uploaded files are
-    cached and then verified in a loop at the end with up to RETRY_ATTEMPTS attempts with a delay of
-    SLEEP_BETWEEN_RETRIES seconds between each attempt."""
+    cached and then verified at the end, CHECK_CONCURRENCY files at a time, with up to RETRY_ATTEMPTS
+    attempts each. Attempts back off exponentially up to SLEEP_BETWEEN_RETRIES seconds between each
+    attempt."""
 
     REQUIRED_OPTIONS = ("ENGINE", "CONNECTION_STRING")
     RETRY_ATTEMPTS = 30
     SLEEP_BETWEEN_RETRIES = 3
+    CHECK_CONCURRENCY = 20
+    DELETE_BATCH_SIZE = 256
+    SMALL_FILE_SIZE = 4 * 1024 * 1024
+    UPLOAD_CONCURRENCY = 8
 
     def account_username(self) -> str:
         return ""
@@ -38,98 +52,152 @@ class AzureBlobStorateBackend(PublisherBackendBase):
         return self.options.get("CONNECTION_STRING", "")
 
     def get_container(self):
-        return self.d["connection"].get_container_client(
+        return self.state.connection.get_container_client(
             container=self.account_container()
         )
 
     def get_blob(self, name: str) -> BlobClient:
-        return self.d["connection"].get_blob_client(
+        return self.state.connection.get_blob_client(
             container=self.account_container(), blob=name
         )
 
     def get_blob_url(self, blob: BlobClient) -> str:
-        blob_parts = urlsplit(blob.url)
-        prefix = "/{}/".format(quote_plus(self.account_container()))
-        path = blob_parts.path
+        match = BLOB_URL_PATH.match(blob.url)
+        path = match.group(1) if match else urlsplit(blob.url).path
+        prefix = self.state.container_prefix
         if path.startswith(prefix):
             path = path[len(prefix) :]
-        parts = (
-            self.remote_url_parts.scheme,
-            self.remote_url_parts.netloc,
-            path,
-            None,
-            None,
+        return urlunsplit(
+            (self.remote_url_parts.scheme, self.remote_url_parts.netloc, path, "", "")
         )
-        return urlunsplit(parts).decode("utf-8")
 
     def authenticate(self) -> bool:
-        self.d["connection"] = BlobServiceClient.from_connection_string(
+        self.state.connection = BlobServiceClient.from_connection_string(
             conn_str=self.connection_string()
         )
+        # Blob URL paths start with the container name, computed once to strip it from every uploaded blob's URL
+        self.state.container_prefix = f"/{quote_plus(self.account_container())}/"
         self._authenticated = True
         return True
 
     def get_remote_files(self) -> set[str]:
+        # The blob listing includes each blob's Content-MD5 and size, keep them so compare_file() does not need a
+        # request per file
         container = self.get_container()
-        rtn = set()
+        remote_md5 = {}
+        remote_sizes = {}
         for obj in container.list_blobs():
-            rtn.add(obj.name)
-        return rtn
+            content_md5 = obj.content_settings.content_md5
+            remote_md5[obj.name] = (
+                hexlify(bytes(content_md5)).decode() if content_md5 else ""
+            )
+            remote_sizes[obj.name] = obj.size
+        self.state.remote_md5 = remote_md5
+        self.state.remote_sizes = remote_sizes
+        return set(remote_md5)
 
     def delete_remote_file(self, remote_name: str) -> bool:
         container = self.get_container()
         return container.delete_blob(remote_name)
 
+    def bulk_delete(self, remote_names: Iterable[str], max_workers: int = 20) -> bool:
+        # Blob batch requests accept up to 256 sub-requests, delete_blobs raises on any failure
+        container = self.get_container()
+        for batch in chunked(remote_names, self.DELETE_BATCH_SIZE):
+            log.info("Deleting: %s files", len(batch))
+            container.delete_blobs(*batch)
+        return True
+
     def check_file(self, local_name: Path | str, url: str) -> bool:
         # Azure uploads are checked in bulk at the end of the uploads, do nothing here
         return True
 
     def compare_file(self, local_name: Path | str, remote_name: str) -> bool:
-        blob = self.get_blob(remote_name)
-        properties = blob.get_blob_properties()
-        content_md5 = properties.get("content_settings", {}).get("content_md5")
-        if not content_md5:
+        # Files with different sizes can not match, skip hashing the local file
+        remote_size = self.state.remote_sizes.get(remote_name)
+        if remote_size is not None and remote_size != os.path.getsize(local_name):
             return False
-        local_hash = self.get_local_file_hash(local_name)
-        remote_hash = str(hexlify(bytes(content_md5)).decode())
+        remote_md5 = self.state.remote_md5
+        if remote_name in remote_md5:
+            remote_hash = remote_md5[remote_name]
+        else:
+            blob = self.get_blob(remote_name)
+            properties = blob.get_blob_properties()
+            content_md5 = properties.get("content_settings", {}).get("content_md5")
+            remote_hash = hexlify(bytes(content_md5)).decode() if content_md5 else ""
+        if not remote_hash:
+            return False
+        local_hash = self.get_cached_local_file_hash(local_name)
         return local_hash == remote_hash
 
     def upload_file(self, local_name: Path | str, remote_name: str) -> bool:
         blob = self.get_blob(remote_name)
         mimetype = self.detect_local_file_mimetype(local_name)
         content_settings = ContentSettings(content_type=mimetype)
-        with open(local_name, "rb") as data:
+        if os.path.getsize(local_name) < self.SMALL_FILE_SIZE:
+            # Small files are read into memory in one go and sent in a single request
+            with open(local_name, "rb") as f:
+                data = f.read()
             result = blob.upload_blob(
                 data, overwrite=True, content_settings=content_settings
             )
-            if result:
-                actual_url = self.get_blob_url(blob)
-                self.d.setdefault("azure_uploads_to_check", []).append(
-                    (local_name, remote_name, actual_url)
+        else:
+            # Larger files are streamed from disk and uploaded in parallel blocks
+            with open(local_name, "rb") as data:
+                result = blob.upload_blob(
+                    data,
+                    overwrite=True,
+                    content_settings=content_settings,
+                    max_concurrency=self.UPLOAD_CONCURRENCY,
                 )
+        if result:
+            actual_url = self.get_blob_url(blob)
+            self.state.uploads_to_check.append((local_name, remote_name, actual_url))
         return result
 
+    def _head_remote_hash(self, url: str) -> bool | str:
+        # HEAD the public URL and use the Content-MD5 header rather than downloading the body to hash it,
+        # falls back to hashing the body if the header is not returned
+        response = self.http_request("HEAD", url)
+        response.read()
+        if response.status != 200:
+            return False
+        content_md5 = response.getheader("Content-MD5")
+        if not content_md5:
+            return self.get_url_hash(url)
+        try:
+            return hexlify(a2b_base64(content_md5)).decode()
+        except BinasciiError:
+            return self.get_url_hash(url)
+
     def _check_file(self, local_name: Path | str, actual_url: str) -> bool:
         # Azure specific patched check_file with retries to account for Azure being slow
-        local_hash = self.get_local_file_hash(local_name)
+        local_hash = self.get_cached_local_file_hash(local_name)
         for i in range(self.RETRY_ATTEMPTS):
-            remote_hash = self.get_url_hash(actual_url)
-            if not remote_hash:
-                sleep(self.SLEEP_BETWEEN_RETRIES)
-                continue
+            remote_hash = self._head_remote_hash(actual_url)
             if local_hash == remote_hash:
                 return True
+            # Back off exponentially with some jitter, capped at SLEEP_BETWEEN_RETRIES, there is no need to wait
+            # after the last attempt
+            if i + 1 < self.RETRY_ATTEMPTS:
+                sleep(min(self.SLEEP_BETWEEN_RETRIES, 0.25 * (2**i)) + uniform(0, 0.1))
         raise StaticSitePublishError(
             f'Failed to upload local file "{local_name}" blob to Azure container at '
             f'URL "{actual_url}" not available over the public URL after {i + 1} attempts'
         )
 
     def final_checks(self) -> bool:
-        # Iterate over any cached files to check and verify they have been uploaded correctly.
-        to_check = self.d.setdefault("azure_uploads_to_check", [])
-        for local_name, remote_name, actual_url in to_check:
-            # Verify the upload, this may require retries
-            self.check_file(local_name, actual_url)
+        # Verify any cached files have been uploaded correctly, checks may require retries so run them in parallel
+        to_check = self.state.uploads_to_check
+        with ThreadPoolExecutor(max_workers=self.CHECK_CONCURRENCY) as executor:
+            # Consume the results so any StaticSitePublishError raised is propagated
+            list(
+                executor.map(
+                    lambda item: self._check_file(item[0], item[2]),
+                    to_check,
+                )
+            )
+        self.state.uploads_to_check = []
         # If we reached here, no StaticSitePublishError was raised
         return True
 
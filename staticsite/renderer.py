@@ -1,16 +1,29 @@
 import errno
+import os
+from html import escape as html_escape
 from logging import getLogger
 from pathlib import Path
 from types import TracebackType
-from collections.abc import Generator
-from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from collections.abc import Callable, Generator, Iterable
+from queue import Queue
+from threading import Thread
+from multiprocessing import get_all_start_methods, get_context
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from django.conf import settings
+from django.db import connections
 from django.urls import URLPattern
-from django.utils.translation import activate as activate_lang
+from django.utils.translation import (
+    activate as activate_lang,
+    get_language,
+    override as override_lang,
+)
 from .errors import StaticSiteError, StaticSiteRenderError
 from .urls import get_staticsite_urls, get_staticsite_url_by_name
 from .request import (
+    get_application,
     internal_wsgi_request,
+    internal_wsgi_request_stream,
     generate_uri,
     get_uri_values,
     get_static_filepath,
@@ -20,14 +33,16 @@ from .utils import get_header, get_langs
 
 
 log = getLogger("main")
+# URLs being rendered by a process pool. Worker processes are forked so they inherit this list and are sent an index
+# into it, rather than each URL pattern being pickled and sent to them
+_render_items = []
+# Directories which are known to exist, so writing each page does not need to check its directory exists
+_known_dirs = set()
 
 
-def render_uri(
-    uri: str, status_codes: tuple[int] | list[int]
-) -> tuple[int, list[tuple[str, str]], bytes]:
+def check_status(status: str, uri: str, status_codes: tuple[int] | list[int]) -> int:
     if not isinstance(status_codes, (tuple, list)):
         status_codes = (200,)
-    status, headers, body = internal_wsgi_request(path=uri, method="GET")
     status_parts = status.split(" ", 1)
     try:
         status_code = int(status_parts[0])
@@ -35,7 +50,31 @@ def render_uri(
         raise StaticSiteRenderError(f"Invalid HTTP status: {status} for URI: {uri}")
     if status_code not in status_codes:
         raise StaticSiteRenderError(f"Unexpected HTTP status: {status} for URI: {uri}")
-    return status_code, headers, body
+    return status_code
+
+
+def render_uri(
+    uri: str, status_codes: tuple[int] | list[int]
+) -> tuple[int, list[tuple[str, str]], bytes]:
+    status, headers, body = internal_wsgi_request(path=uri, method="GET")
+    return check_status(status, uri, status_codes), headers, body
+
+
+def render_uri_to_file(
+    uri: str, status_codes: tuple[int] | list[int], full_path: Path
+) -> tuple[int, list[tuple[str, str]], int]:
+    """Renders a URI and streams the response body directly to a file, the body is never held in memory. Returns
+    the status, headers and the number of bytes written."""
+    status, headers, body = internal_wsgi_request_stream(path=uri, method="GET")
+    status_code = check_status(status, uri, status_codes)
+    return status_code, headers, write_file(full_path, body)
+
+
+def _activate_lang(language_code: str | None) -> None:
+    """Activates a language for rendering, skipping the activation when it is already the active language as
+    consecutive renders are usually in the same language."""
+    if language_code and language_code != get_language():
+        activate_lang(language_code)
 
 
 def render_pattern(
@@ -43,8 +82,7 @@ def render_pattern(
     param_set: list[str | None] | tuple[str | None] | tuple,
     language_code: str | None,
 ) -> tuple[str, str, int, list, bytes]:
-    if language_code:
-        activate_lang(language_code)
+    _activate_lang(language_code)
     generated_uri = generate_uri(pattern.staticsite_namespace, pattern.name, param_set)
     status, headers, body = render_uri(generated_uri, pattern.staticsite_status_codes)
     generated_filename = generate_filename(
@@ -53,13 +91,73 @@ def render_pattern(
     return generated_uri, generated_filename, status, headers, body
 
 
-def write_file(full_path: Path, content: bytes) -> None:
+def render_pattern_to_file(
+    pattern: URLPattern,
+    param_set: list[str | None] | tuple[str | None] | tuple,
+    language_code: str | None,
+    output_dir: Path,
+) -> tuple[str, Path, str, int, list, int]:
+    _activate_lang(language_code)
+    generated_uri = generate_uri(pattern.staticsite_namespace, pattern.name, param_set)
+    generated_filename = generate_filename(
+        pattern.staticsite_filename, generated_uri, param_set
+    )
+    full_path, local_uri = get_static_filepath(
+        output_dir, generated_filename, generated_uri
+    )
+    status, headers, size = render_uri_to_file(
+        generated_uri, pattern.staticsite_status_codes, full_path
+    )
+    return generated_uri, full_path, local_uri, status, headers, size
+
+
+def get_render_langs(
+    pattern: URLPattern, param_set: list[str | None] | tuple[str | None] | tuple
+) -> list[str]:
+    """Returns the languages to render a URL in. URLs which are not language prefixed generate the same URI in
+    every language and each render overwrites the last, so each URI is only rendered in the last language that
+    generates it."""
+    langs_by_uri = {}
+    for lang in get_langs():
+        with override_lang(lang):
+            uri = generate_uri(pattern.staticsite_namespace, pattern.name, param_set)
+        langs_by_uri.pop(uri, None)
+        langs_by_uri[uri] = lang
+    return list(langs_by_uri.values())
+
+
+def _render_item(render_func: Callable, index: int) -> list[tuple]:
+    """Renders a URL from _render_items in each language, run in forked render worker processes."""
+    pattern, param_set, uri = _render_items[index]
+    langs = get_render_langs(pattern, param_set)
+    return [render_func(pattern, param_set, lang) for lang in langs]
+
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def open_for_write(full_path: Path) -> int:
+    """Opens a file for writing and returns its file descriptor, creating its directory if needed. Directories
+    already created are not checked again for every file, the file is opened and the directory is only created
+    again if it has since been removed."""
+    parent_dir = str(full_path.parent)
+    if parent_dir in _known_dirs:
+        try:
+            return os.open(full_path, _WRITE_FLAGS, 0o666)
+        except FileNotFoundError:
+            pass
+    # Pages can be written concurrently so another writer may create the directory first
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    _known_dirs.add(parent_dir)
+    return os.open(full_path, _WRITE_FLAGS, 0o666)
+
+
+def write_file(full_path: Path, content: bytes | Iterable[bytes]) -> int:
+    """Writes bytes, or an iterable of bytes chunks, to a file. Returns the number of bytes written. Bytes are
+    written straight to the file descriptor, skipping the buffered IO layer, chunks are buffered as streamed
+    responses can be made up of many small chunks."""
     try:
-        if not full_path.parent.is_dir():
-            log.info(f"Creating directory: {full_path.parent}")
-            full_path.parent.mkdir(parents=True)
-        with open(full_path, "wb") as f:
-            f.write(content)
+        fd = open_for_write(full_path)
     except IOError as e:
         if e.errno == errno.EISDIR:
             raise StaticSiteError(
@@ -68,6 +166,62 @@ def write_file(full_path: Path, content: bytes) -> None:
             )
         else:
             raise
+    if isinstance(content, bytes):
+        try:
+            view = memoryview(content)
+            written = 0
+            while written < len(view):
+                written += os.write(fd, view[written:])
+            return written
+        finally:
+            os.close(fd)
+    with open(fd, "wb") as f:
+        size = 0
+        for chunk in content:
+            size += f.write(chunk)
+        return size
+
+
+class AsyncFileWriter:
+    """Writes files in a background thread so writing overlaps with rendering. At most maxsize files are queued
+    so rendering can not run far ahead of the disk. The first error raised writing a file is raised by the next
+    call to write() or by close()."""
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self._queue = Queue(maxsize=maxsize)
+        self._error = None
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "AsyncFileWriter":
+        return self
+
+    def __exit__(
+        self,
+        type_: type[BaseException] | None,
+        value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> bool | None:
+        self.close(raise_error=type_ is None)
+
+    def _run(self) -> None:
+        while (item := self._queue.get()) is not None:
+            if self._error is None:
+                try:
+                    write_file(*item)
+                except Exception as e:
+                    self._error = e
+
+    def write(self, full_path: Path, content: bytes) -> None:
+        if self._error is not None:
+            raise self._error
+        self._queue.put((full_path, content))
+
+    def close(self, raise_error: bool = True) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        if raise_error and self._error is not None:
+            raise self._error
 
 
 def write_single_pattern(
@@ -97,42 +251,52 @@ def write_single_pattern(
     else:
         param_set = ()
     pattern = get_staticsite_url_by_name(pattern_name, namespace=namespace)
-    generated_uri, generated_filename, status, headers, body = render_pattern(
-        pattern, param_set, language_code
+    generated_uri, full_path, local_uri, status, headers, size = render_pattern_to_file(
+        pattern, param_set, language_code, file_path
     )
     mime = get_header(headers, "Content-Type")
-    full_path, local_uri = get_static_filepath(
-        file_path, generated_filename, generated_uri
-    )
     log.info(
-        f'Rendering single static page: {local_uri} -> {full_path} ("{mime}", {len(body)} bytes, from {pattern})'
+        'Rendered single static page: %s -> %s ("%s", %s bytes, from %s)',
+        local_uri,
+        full_path,
+        mime,
+        size,
+        pattern,
     )
-    write_file(Path(full_path), body)
 
 
-def render_static_redirect(destination_url: str) -> bytes:
-    redir = [
+_REDIRECT_TEMPLATE = "\n".join(
+    [
         "<!DOCTYPE html>",
         "<html>",
         "<head>",
         '<meta charset="UTF-8">',
-        f'<meta http-equiv="refresh" content="0;URL={destination_url}" />',
-        f"<title>Redirecting to {destination_url}</title>",
+        '<meta http-equiv="refresh" content="0;URL={u}" />',
+        "<title>Redirecting to {u}</title>",
         '<meta name="robots" content="noindex" />',
         "</head>",
         "<body>",
-        f'<h1>Redirecting to <a href="{destination_url}">{destination_url}</a></h1>',
-        f'<p>If you are not automatically redirected please click <a href="{destination_url}">this link</a></p>',
+        '<h1>Redirecting to <a href="{u}">{u}</a></h1>',
+        '<p>If you are not automatically redirected please click <a href="{u}">this link</a></p>',
         "</html>",
     ]
-    return "\n".join(redir).encode()
+).encode()
 
 
-def render_redirects(output_dir: Path | str) -> bool:
+def render_static_redirect(destination_url: str) -> bytes:
+    return _REDIRECT_TEMPLATE.replace(
+        b"{u}", html_escape(destination_url, quote=True).encode()
+    )
+
+
+def iter_render_redirects(output_dir: Path | str) -> Generator[Path]:
+    """Renders redirect pages to a directory, yielding the path of each file as soon as it has been written."""
     from django.contrib.redirects.models import Redirect
+
     if isinstance(output_dir, str):
         output_dir = Path(output_dir)
-    for redirect in Redirect.objects.all():
+    redirects = Redirect.objects.only("old_path", "new_path").iterator(chunk_size=2000)
+    for redirect in redirects:
         redirect_path = redirect.old_path.lstrip("/")
         if redirect_path.lower().endswith(".html"):
             redirect_file = redirect_path
@@ -143,9 +307,18 @@ def render_redirects(output_dir: Path | str) -> bool:
         )
         content = render_static_redirect(redirect.new_path)
         log.info(
-            f"Rendering redirect page: {local_uri} -> {full_path} (redirects to: {redirect_file})"
+            "Rendering redirect page: %s -> %s (redirects to: %s)",
+            local_uri,
+            full_path,
+            redirect_file,
         )
         write_file(full_path, content)
+        yield full_path
+
+
+def render_redirects(output_dir: Path | str) -> bool:
+    for _ in iter_render_redirects(output_dir):
+        pass
     return True
 
 
@@ -154,7 +327,7 @@ class StaticSiteRenderer:
         self,
         urls_to_render: list[URLPattern] | None = None,
         hostname: str | None = None,
-        enable_debug: bool = True,
+        enable_debug: bool = False,
         concurrency: int = 1,
     ) -> None:
         self._site_debug = settings.DEBUG
@@ -167,6 +340,7 @@ class StaticSiteRenderer:
         self.hostname = hostname
         self.enable_debug = enable_debug
         self.concurrency = concurrency
+        self._thread_executor = None
 
     def __enter__(self) -> "StaticSiteRenderer":
         if self.hostname:
@@ -174,8 +348,9 @@ class StaticSiteRenderer:
         else:
             # Static sites generally want to ignore hostnames when being generated
             settings.ALLOWED_HOSTS = ["*"]
-        # if self.enable_debug:
-        settings.DEBUG = True
+        # DEBUG makes every render slower (e.g. every database query is logged) so it is only enabled on request
+        if self.enable_debug:
+            settings.DEBUG = True
         return self
 
     def __exit__(
@@ -187,6 +362,9 @@ class StaticSiteRenderer:
         # Restore any modified settings
         settings.ALLOWED_HOSTS = self._site_allowed_hosts
         settings.DEBUG = self._site_debug
+        if self._thread_executor is not None:
+            self._thread_executor.shutdown()
+            self._thread_executor = None
 
     def get_urls_to_render(
         self,
@@ -213,35 +391,121 @@ class StaticSiteRenderer:
     ) -> Generator[tuple[URLPattern, str, str, int, dict, bytes]]:
         """Iterates all static site URL patterns, then calls each URL generator function for each pattern.
         Yields the generated URI, filename, status, headers, and body."""
+        # render = (pattern, generated_uri, generated_filename, status, headers, body)
+        yield from self._iter_rendered(render_pattern)
+
+    def use_processes(self) -> bool:
+        """Rendering runs views which are CPU bound Python, so concurrent renders use a pool of forked processes
+        to avoid the GIL. Threads are used for a concurrency of 1, on platforms which can not fork, and inside a
+        database transaction as the forked processes use their own database connections."""
+        if self.concurrency <= 1 or "fork" not in get_all_start_methods():
+            return False
+        return not any(
+            conn.in_atomic_block for conn in connections.all(initialized_only=True)
+        )
 
-        def _render(item):
-            rtn = []
-            pattern, param_set, uri = item
-            for lang in get_langs():
-                rtn.append((pattern,) + render_pattern(pattern, param_set, lang))
-            return rtn
+    def _iter_rendered(self, render_func: Callable) -> Generator[tuple]:
+        """Calls render_func(pattern, param_set, language_code) for every URL to render in every language,
+        concurrency at a time, and yields the pattern followed by each result in order."""
+        to_render = self.get_urls_to_render()
+        if not self.use_processes():
 
-        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
-            results = executor.map(_render, self.get_urls_to_render())
-            for result in results:
+            def _render(item):
+                pattern, param_set, uri = item
+                langs = get_render_langs(pattern, param_set)
+                return [render_func(pattern, param_set, lang) for lang in langs]
+
+            if self.concurrency <= 1 or len(to_render) <= 1:
+                # Not worth a thread pool, render in this thread and restore the active language afterwards
+                with override_lang(get_language()):
+                    for (pattern, param_set, uri), result in zip(
+                        to_render, map(_render, to_render)
+                    ):
+                        for render in result:
+                            yield (pattern,) + render
+                return
+            # The thread pool is reused by every render until the renderer exits
+            if self._thread_executor is None:
+                self._thread_executor = ThreadPoolExecutor(max_workers=self.concurrency)
+            results = self._thread_executor.map(_render, to_render)
+            for (pattern, param_set, uri), result in zip(to_render, results):
                 for render in result:
-                    # render = (pattern, generated_uri, generated_filename, status, headers, body)
-                    yield render
+                    yield (pattern,) + render
+            return
+        global _render_items
+        # Database connections must not be shared with the forked processes, they each open their own
+        connections.close_all()
+        _render_items = to_render
+        # Create the WSGI application before forking so the workers inherit it
+        get_application()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.concurrency, mp_context=get_context("fork")
+            ) as executor:
+                # Send several URLs to a worker at a time to reduce the overhead per URL
+                chunksize = max(1, len(to_render) // (4 * self.concurrency))
+                results = executor.map(
+                    partial(_render_item, render_func),
+                    range(len(to_render)),
+                    chunksize=chunksize,
+                )
+                for (pattern, param_set, uri), result in zip(to_render, results):
+                    for render in result:
+                        yield (pattern,) + render
+        finally:
+            _render_items = []
 
-    def render_to_directory(self, output_dir: Path | str) -> None:
+    def iter_render_to_directory(self, output_dir: Path | str) -> Generator[Path]:
+        """Renders the static site to a directory, yielding the path of each file as soon as it has been written.
+        Each page is streamed to its file as it is rendered, by the worker process when rendering in processes."""
         log.info(f"Rendering static site to directory: {output_dir}")
         if isinstance(output_dir, str):
             output_dir = Path(output_dir)
         if not isinstance(output_dir, Path):
             raise StaticSiteError(f"Invalid output directory: {output_dir}")
-        for render in self.render():
-            pattern, generated_uri, generated_filename, status, headers, body = render
+        render_func = partial(render_pattern_to_file, output_dir=output_dir)
+        for render in self._iter_rendered(render_func):
+            pattern, generated_uri, full_path, local_uri, status, headers, size = render
             mime = get_header(headers, "Content-Type")
-            full_path, local_uri = get_static_filepath(
-                output_dir, generated_filename, generated_uri
-            )
             log.info(
-                f'Rendering static page: {local_uri} -> {full_path} ("{mime}", {len(body)} bytes, from {pattern})'
+                'Rendered static page: %s -> %s ("%s", %s bytes, from %s)',
+                local_uri,
+                full_path,
+                mime,
+                size,
+                pattern,
             )
-            write_file(Path(full_path), body)
+            yield full_path
+        log.info("Rendering static site to directory complete")
+
+    def render_to_directory(self, output_dir: Path | str) -> None:
+        """Renders the static site to a directory. Forked render processes write their own pages, otherwise pages
+        are written by a background thread while the next pages render."""
+        if self.use_processes():
+            for _ in self.iter_render_to_directory(output_dir):
+                pass
+            return
+        log.info(f"Rendering static site to directory: {output_dir}")
+        if isinstance(output_dir, str):
+            output_dir = Path(output_dir)
+        if not isinstance(output_dir, Path):
+            raise StaticSiteError(f"Invalid output directory: {output_dir}")
+        with AsyncFileWriter() as writer:
+            for render in self.render():
+                pattern, generated_uri, generated_filename, status, headers, body = (
+                    render
+                )
+                mime = get_header(headers, "Content-Type")
+                full_path, local_uri = get_static_filepath(
+                    output_dir, generated_filename, generated_uri
+                )
+                log.info(
+                    'Rendering static page: %s -> %s ("%s", %s bytes, from %s)',
+                    local_uri,
+                    full_path,
+                    mime,
+                    len(body),
+                    pattern,
+                )
+                writer.write(full_path, body)
         log.info("Rendering static site to directory complete")
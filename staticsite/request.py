@@ -1,15 +1,65 @@
-import os
 from io import BytesIO
 from pathlib import Path
 from types import GeneratorType, FunctionType
+from collections.abc import Generator
 from inspect import getfullargspec
+from threading import Lock
+from functools import lru_cache
 from urllib.parse import urlencode
 from django.core.wsgi import get_wsgi_application
-from django.urls import reverse, NoReverseMatch
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import reverse, NoReverseMatch, get_script_prefix, get_urlconf
+from django.utils.translation import get_language
 from .errors import StaticSiteError
 
 
-def internal_wsgi_request(
+_application = None
+_application_lock = Lock()
+
+
+def get_application():
+    """Returns the Django WSGI application used for internal requests. get_wsgi_application() runs django.setup()
+    and creates a new handler on every call so the application is only created once per process."""
+    global _application
+    if _application is None:
+        with _application_lock:
+            if _application is None:
+                _application = get_wsgi_application()
+    return _application
+
+
+@receiver(setting_changed)
+def clear_request_caches(*, setting: str, **kwargs) -> None:
+    global _application
+    if setting == "MIDDLEWARE":
+        # The application loads the middleware when it is created
+        _application = None
+    elif setting == "ROOT_URLCONF":
+        _reverse.cache_clear()
+
+
+class _EmptyInput:
+    """A request body which is always empty. Unlike an empty BytesIO it has no read position so a single
+    instance can be shared by every request without a body."""
+
+    def read(self, size: int = -1) -> bytes:
+        return b""
+
+    def readline(self, size: int = -1) -> bytes:
+        return b""
+
+    def readlines(self, hint: int = -1) -> list[bytes]:
+        return []
+
+    def __iter__(self):
+        return iter(())
+
+
+_empty_input = _EmptyInput()
+
+
+def internal_wsgi_request_stream(
     path: str = "/",
     method: str = "GET",
     data: str | bytes | None = None,
@@ -18,8 +68,9 @@ def internal_wsgi_request(
     | tuple[tuple[str, str]]
     | None = None,
     headers: dict | None = None,
-) -> tuple[str, list[tuple[str, str]], bytes]:
-    """Create a synthetic WSGI request, make the request internally and return the rendered output."""
+) -> tuple[str, list[tuple[str, str]], Generator[bytes]]:
+    """Create a synthetic WSGI request and make the request internally. Returns the status and headers and a
+    generator of the response body chunks, so large responses can be written out without buffering them."""
 
     # Default WSGI environment
     env = {
@@ -44,12 +95,11 @@ def internal_wsgi_request(
         env["CONTENT_TYPE"] = "application/x-www-form-urlencoded"
         env["wsgi.input"] = BytesIO(post_data)
     else:
-        env["wsgi.input"] = BytesIO()
-    # Create a Django WSGI application
-    application = get_wsgi_application()
+        env["wsgi.input"] = _empty_input
+    application = get_application()
     # Submit the internal request and capture the output
     response_headers = []
-    response_body = []
+    response_written = []
     response_statuses = []
 
     def start_response(status, headers):
@@ -57,20 +107,12 @@ def internal_wsgi_request(
         response_headers.extend(headers)
 
         def write(data):
-            response_body.append(data)
+            response_written.append(data)
 
         return write
 
     response_chunks = application(env, start_response)
 
-    # Collect all response chunks
-    for chunk in response_chunks:
-        if chunk:
-            if isinstance(chunk, str):
-                response_body.append(chunk.encode("utf-8"))
-            else:
-                response_body.append(chunk)
-
     # Confirm there was a single HTTP status returned
     if len(response_statuses) == 1:
         response_status_code = response_statuses[0]
@@ -79,18 +121,52 @@ def internal_wsgi_request(
             f"Expected a single HTTP status code, got {response_statuses}"
         )
 
+    def iter_body():
+        yield from response_written
+        for chunk in response_chunks:
+            if chunk:
+                if isinstance(chunk, str):
+                    yield chunk.encode("utf-8")
+                else:
+                    yield chunk
+
+    return response_status_code, response_headers, iter_body()
+
+
+def internal_wsgi_request(
+    path: str = "/",
+    method: str = "GET",
+    data: str | bytes | None = None,
+    query_params: dict[str, str]
+    | list[tuple[str, str]]
+    | tuple[tuple[str, str]]
+    | None = None,
+    headers: dict | None = None,
+) -> tuple[str, list[tuple[str, str]], bytes]:
+    """Create a synthetic WSGI request, make the request internally and return the rendered output."""
+    status, response_headers, body = internal_wsgi_request_stream(
+        path=path,
+        method=method,
+        data=data,
+        query_params=query_params,
+        headers=headers,
+    )
     # Return the rendered HTML
-    response_body_bytes = b"".join(response_body)
-    return response_status_code, response_headers, response_body_bytes
+    return status, response_headers, b"".join(body)
+
+
+@lru_cache(maxsize=None)
+def _generator_accepts_view_name(func: FunctionType) -> bool:
+    """Returns True if a staticsite_urls_generator function takes a view_name argument."""
+    return "view_name" in getfullargspec(func).args
 
 
 def get_uri_values(
     func: FunctionType, view_name: str
 ) -> list[str | int | None] | tuple[None]:
     """Call the staticsite_urls_generator function for a view and normalises the result to be a list."""
-    fullargspec = getfullargspec(func)
     try:
-        if "view_name" in fullargspec.args:
+        if _generator_accepts_view_name(func):
             v = func(view_name)
         else:
             v = func()
@@ -118,21 +194,49 @@ def generate_uri(
     if param_set is None:
         param_set = ()
     if isinstance(param_set, (list, tuple)):
-        try:
-            uri = reverse(view_name, args=param_set)
-        except NoReverseMatch:
-            uri = reverse(view_name_ns, args=param_set)
+        args, kwargs = tuple(param_set), None
     elif isinstance(param_set, dict):
-        try:
-            uri = reverse(view_name, kwargs=param_set)
-        except NoReverseMatch:
-            uri = reverse(view_name_ns, kwargs=param_set)
+        args, kwargs = None, tuple(param_set.items())
     else:
         raise StaticSiteError(
             f"Unable to generate staticsite URI, "
             f"URL generator function returned an invalid type: {type(param_set)}"
         )
-    return uri
+    reverse_args = (
+        view_name,
+        view_name_ns,
+        args,
+        kwargs,
+        get_language(),
+        get_script_prefix(),
+        get_urlconf(),
+    )
+    try:
+        return _reverse(*reverse_args)
+    except TypeError:
+        # Parameters which can not be hashed are not cached
+        return _reverse.__wrapped__(*reverse_args)
+
+
+@lru_cache(maxsize=4096)
+def _reverse(
+    view_name: str,
+    view_name_ns: str,
+    args: tuple | None,
+    kwargs: tuple[tuple[str, str], ...] | None,
+    language_code: str | None,
+    script_prefix: str,
+    urlconf: str | None,
+) -> str:
+    """Reverses a view name, falling back to the namespaced view name. Each URI is generated once per parameter
+    set, when listing the URLs to render and again when rendering them in each language, so results are cached.
+    Reversed URIs can depend on the active language, script prefix and URLconf so these are part of the key."""
+    if kwargs is not None:
+        kwargs = dict(kwargs)
+    try:
+        return reverse(view_name, urlconf=urlconf, args=args, kwargs=kwargs)
+    except NoReverseMatch:
+        return reverse(view_name_ns, urlconf=urlconf, args=args, kwargs=kwargs)
 
 
 def get_static_filepath(
@@ -144,10 +248,8 @@ def get_static_filepath(
         full_path = output_dir / file_name
     else:
         local_uri = page_uri
-        if page_uri.startswith("/"):
-            page_uri = page_uri[1:]
-        page_path = page_uri.replace("/", os.sep)
-        full_path = output_dir / page_path
+        # Path accepts / as a separator on every platform, so the URI is joined without replacing separators
+        full_path = output_dir / page_uri.lstrip("/")
     return full_path, local_uri
 
 
@@ -155,6 +257,9 @@ def generate_filename(
     file_name: str, uri: str, param_set: list[str | None] | tuple[str | None]
 ) -> str | None:
     if file_name is not None:
+        # str.format() parses the template in C, only filenames without any replacement fields skip it
+        if "{" not in file_name and "}" not in file_name:
+            return file_name
         if isinstance(param_set, dict):
             return file_name.format(**param_set)
         else:
@@ -1,6 +1,8 @@
+import os
 from logging import getLogger
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections.abc import Generator
-from shutil import copy2
+from shutil import SameFileError, copy2, copystat
 from pathlib import Path
 from django.conf import settings
 
@@ -8,57 +10,169 @@ from django.conf import settings
 log = getLogger("main")
 
 
-def filter_static_dirs(dirs: list[str]) -> list[str]:
+# Directories of admin static files, skipped unless STATICSITE_SKIP_ADMIN_DIRECTORIES is False
+ADMIN_STATIC_DIRS = frozenset(("admin", "grappelli", "unfold"))
+
+
+def get_ignored_static_dirs() -> frozenset[str]:
+    """Returns the names of directories which are not copied or published, read from the settings once so
+    walking a tree does not read the settings again for every directory."""
     skip_admin_dirs = bool(getattr(settings, "STATICSITE_SKIP_ADMIN_DIRECTORIES", True))
-    _ignore_dirs = []
-    if skip_admin_dirs:
-        _ignore_dirs = [
-            "admin",
-            "grappelli",
-            "unfold",
-        ]
     try:
         skip_dirs = list(getattr(settings, "STATICSITE_SKIP_STATICFILES_DIRECTORIES", []))
     except (ValueError, TypeError):
         skip_dirs = []
-    for d in skip_dirs:
-        if isinstance(d, str):
-            _ignore_dirs.append(d)
-    return [d for d in dirs if d not in _ignore_dirs]
-
-
-def copy_static(
-    dir_from: Path | str, dir_to: Path | str
-) -> Generator[tuple[Path, Path]]:
-    if isinstance(dir_from, str):
-        dir_from = Path(dir_from)
-    if isinstance(dir_to, str):
-        dir_to = Path(dir_to)
-    for root, dirs, files in dir_from.walk():
-        dirs[:] = filter_static_dirs(dirs)
-        for f in files:
-            from_path = root / f
-            to_path = dir_to / from_path.relative_to(dir_from)
-            to_path_dir = to_path.parent
-            if not to_path_dir.is_dir():
-                to_path_dir.mkdir(parents=True)
-            copy2(from_path, to_path)
-            yield from_path, to_path
+    _ignore_dirs = frozenset(d for d in skip_dirs if isinstance(d, str))
+    if skip_admin_dirs:
+        _ignore_dirs |= ADMIN_STATIC_DIRS
+    return _ignore_dirs
 
 
-def copy_static_and_media_files(
-    output_dir: Path | str,
-) -> bool:
+def filter_static_dirs(
+    dirs: list[str], ignore_dirs: frozenset[str] | None = None
+) -> list[str]:
+    if ignore_dirs is None:
+        ignore_dirs = get_ignored_static_dirs()
+    return [d for d in dirs if d not in ignore_dirs]
+
+
+def get_copy_workers() -> int:
+    """Returns the number of files to copy in parallel, copying is IO bound so this defaults to more threads than
+    there are CPUs."""
+    default_workers = min(32, (os.cpu_count() or 1) * 4)
+    workers = getattr(settings, "STATICSITE_COPY_WORKERS", default_workers)
+    try:
+        return max(1, int(workers))
+    except (ValueError, TypeError):
+        return default_workers
+
+
+def walk_static(dir_from: str, dir_to: str) -> Generator[tuple[str, str]]:
+    """Yields the source and destination paths, as strings, of every file in a directory tree which is to be
+    copied, skipping filtered directories. Directory entries from os.scandir() already know if they are
+    directories so no other filesystem calls are made. Directories which can not be read are skipped."""
+    ignore_dirs = get_ignored_static_dirs()
+    to_walk = [(dir_from, dir_to)]
+    while to_walk:
+        walk_from, walk_to = to_walk.pop()
+        try:
+            with os.scandir(walk_from) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        dirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry.name)
+            else:
+                yield entry.path, os.path.join(walk_to, entry.name)
+        for d in filter_static_dirs(dirs, ignore_dirs):
+            to_walk.append((os.path.join(walk_from, d), os.path.join(walk_to, d)))
+
+
+def copy_file(from_path: Path | str, to_path: Path | str) -> None:
+    """Copies a file and its metadata like shutil.copy2(). Where os.copy_file_range() is available the data is
+    copied inside the kernel, which can share the data blocks on copy-on-write filesystems instead of copying
+    them. shutil.copy2() is used if the filesystem does not support it."""
+    if not hasattr(os, "copy_file_range"):
+        copy2(from_path, to_path)
+        return
+    # Opening the destination truncates it, which would empty the source if they are the same file (such as a hard
+    # link made by link_file()), so refuse like shutil.copy2() does
+    try:
+        if os.path.samefile(from_path, to_path):
+            raise SameFileError(f"{from_path!r} and {to_path!r} are the same file")
+    except FileNotFoundError:
+        pass
+    with open(from_path, "rb") as fsrc, open(to_path, "wb") as fdst:
+        from_fd, to_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(from_fd).st_size
+        copied = 0
+        try:
+            while copied < size:
+                written = os.copy_file_range(from_fd, to_fd, size - copied)
+                if not written:
+                    break
+                copied += written
+        except OSError:
+            # Unsupported by the filesystem, or the files are on different filesystems on older kernels
+            copied = -1
+    if copied != size:
+        # Some filesystems report files as empty to copy_file_range(), copy2() copies anything not copied
+        copy2(from_path, to_path)
+        return
+    copystat(from_path, to_path)
+
+
+def link_file(from_path: Path | str, to_path: Path | str) -> None:
+    """Hard links a file into place instead of copying it, an existing file at the destination is replaced. Falls
+    back to copy_file() when the file can not be linked, for example when the destination is on a different
+    filesystem."""
+    try:
+        os.link(from_path, to_path)
+        return
+    except FileExistsError:
+        pass
+    except OSError:
+        copy_file(from_path, to_path)
+        return
+    try:
+        os.unlink(to_path)
+        os.link(from_path, to_path)
+    except OSError:
+        copy_file(from_path, to_path)
+
+
+def copy_files(to_copy: list[tuple]) -> Generator[tuple]:
+    """Copies files from a list of (source path, destination path, ...) tuples, yielding each tuple as soon as its
+    file has been copied. Files are copied in parallel by a pool of threads, directories are all created first so
+    the copying threads never create the same directory at the same time."""
+    to_path_dirs = {os.path.dirname(item[1]) for item in to_copy}
+    for to_path_dir in to_path_dirs:
+        os.makedirs(to_path_dir, exist_ok=True)
+    # Hard linking files is opt-in as the linked files share their contents with the source files
+    if getattr(settings, "STATICSITE_LINK_STATIC", False):
+        copy_func = link_file
+    else:
+        copy_func = copy_file
+    workers = get_copy_workers()
+    if workers == 1 or len(to_copy) <= 1:
+        for item in to_copy:
+            copy_func(item[0], item[1])
+            yield item
+        return
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {
+            executor.submit(copy_func, item[0], item[1]): item for item in to_copy
+        }
+        for future in as_completed(futures):
+            future.result()
+            yield futures[future]
+    finally:
+        # Copies not yet started are cancelled if copying fails or the caller stops iterating
+        executor.shutdown(cancel_futures=True)
+
+
+def copy_static(dir_from: Path | str, dir_to: Path | str) -> Generator[tuple[str, str]]:
+    """Copies all files in a directory to another directory, yielding the source and destination paths of each
+    file, as strings, as soon as it has been copied."""
+    yield from copy_files(list(walk_static(os.fspath(dir_from), os.fspath(dir_to))))
+
+
+def iter_copy_static_and_media_files(output_dir: Path | str) -> Generator[Path]:
+    """Copies static and media files to a directory, yielding the path of each file as soon as it has been
+    copied. Static and media files are copied together by the same pool of threads."""
     if isinstance(output_dir, str):
         output_dir = Path(output_dir)
+    to_copy = []
     static_url = str(getattr(settings, "STATIC_URL", ""))
     static_root = str(getattr(settings, "STATIC_ROOT", ""))
     if static_url and static_root:
-        static_root = Path(static_root)
         static_url = static_url[1:] if static_url.startswith("/") else static_url
-        static_output_dir = output_dir / static_url
-        for file_from, file_to in copy_static(static_root, static_output_dir):
-            log.info(f"Copying static file: {file_from} -> {file_to}")
+        static_output_dir = str(output_dir / static_url)
+        for file_from, file_to in walk_static(static_root, static_output_dir):
+            to_copy.append((file_from, file_to, "static"))
     else:
         log.error(
             "STATIC_URL and STATIC_ROOT must be set in settings.py to copy static files"
@@ -66,13 +180,22 @@ def copy_static_and_media_files(
     media_url = str(getattr(settings, "MEDIA_URL", ""))
     media_root = str(getattr(settings, "MEDIA_ROOT", ""))
     if media_url and media_root:
-        media_root = Path(media_root)
         media_url = media_url[1:] if media_url.startswith("/") else media_url
-        media_output_dir = output_dir / media_url
-        for file_from, file_to in copy_static(media_root, media_output_dir):
-            log.info(f"Copying media file: {file_from} -> {file_to}")
+        media_output_dir = str(output_dir / media_url)
+        for file_from, file_to in walk_static(media_root, media_output_dir):
+            to_copy.append((file_from, file_to, "media"))
     else:
         log.warning(
             "MEDIA_URL and MEDIA_ROOT must be set in settings.py to copy media files"
         )
+    for file_from, file_to, file_type in copy_files(to_copy):
+        log.info("Copying %s file: %s -> %s", file_type, file_from, file_to)
+        yield Path(file_to)
+
+
+def copy_static_and_media_files(
+    output_dir: Path | str,
+) -> bool:
+    for _ in iter_copy_static_and_media_files(output_dir):
+        pass
     return True
@@ -6,12 +6,16 @@ staticsite_urls = []
 staticsite_urls_by_name = {}
 
 
+def get_view_name(name: str, namespace: str | None = None) -> str:
+    """Return the full view name, in the same "namespace:name" format used by reverse(), for a name and namespace."""
+    return f"{namespace}:{name}" if namespace else name
+
+
 def add_staticsite_url(pattern: URLPattern) -> None:
     """Register a URLPattern as a static site pattern."""
     staticsite_urls.append(pattern)
-    staticsite_urls_by_name.setdefault(pattern.staticsite_namespace, {})[
-        pattern.name
-    ] = pattern
+    view_name = get_view_name(pattern.name, pattern.staticsite_namespace)
+    staticsite_urls_by_name[view_name] = pattern
 
 
 def get_staticsite_urls() -> list[URLPattern]:
@@ -20,11 +24,12 @@ def get_staticsite_urls() -> list[URLPattern]:
 
 
 def get_staticsite_url_by_name(name: str, namespace: str | None = None) -> URLPattern:
-    """Return a URLPattern object which has been registered as a static site pattern by name."""
+    """Return a URLPattern object which has been registered as a static site pattern by name. The name may also be
+    a full "namespace:name" view name."""
+    view_name = get_view_name(name, namespace)
     try:
-        return staticsite_urls_by_name[namespace][name]
+        return staticsite_urls_by_name[view_name]
     except KeyError:
-        view_name = f"{namespace}:{name}" if namespace else name
         raise ImproperlyConfigured(
             f'The view "{view_name}" is not registered as a static site path'
         )
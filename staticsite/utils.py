@@ -1,9 +1,16 @@
 import os
+import shutil
 import tempfile
+import subprocess
 from binascii import hexlify
 from pathlib import Path
-from collections.abc import Generator
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from django.conf import settings, global_settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.urls import URLPattern, URLResolver, get_resolver
 
 
@@ -18,30 +25,62 @@ def set_func_attr(name, value):
 
 
 def iter_url_patterns(
-    url_patterns: list | None = None, namespace: str = "", depth: int = 0
+    url_patterns: list | None = None,
+    namespace: str = "",
+    depth: int = 0,
+    static_only: bool = False,
 ) -> Generator[tuple[URLPattern, str | None, int]]:
     """
     Yield tuples of (URLPattern, namespace) for all URLPattern objects in the
-    provided Django URLconf, or the default one if none is provided.
+    provided Django URLconf, or the default one if none is provided. If static_only is
+    True only static site URLPattern objects are yielded and any URLResolver already
+    known to contain no static site paths is skipped without being traversed.
     """
     if url_patterns is None:
         url_patterns = get_resolver().url_patterns
-    for pattern in url_patterns:
-        if isinstance(pattern, URLPattern):
-            if depth == 0:
-                namespace = None
-            yield pattern, namespace, 1
-        elif isinstance(pattern, URLResolver):
-            if pattern.namespace:
-                if namespace:
-                    namespace = f"{namespace}:{pattern.namespace}"
+    # URLResolvers are traversed with a stack rather than recursion, each frame is a list of
+    # [patterns iterator, namespace, URLResolver or None, found any static site paths]
+    stack = [[iter(url_patterns), namespace, None, False]]
+    while stack:
+        frame = stack[-1]
+        namespace = frame[1]
+        for pattern in frame[0]:
+            if isinstance(pattern, URLPattern):
+                is_static = getattr(pattern, "is_static", False)
+                if static_only and not is_static:
+                    continue
+                if is_static:
+                    frame[3] = True
+                yield pattern, namespace or None, 1
+            elif isinstance(pattern, URLResolver):
+                if (
+                    static_only
+                    and getattr(pattern, "staticsite_has_static", None) is False
+                ):
+                    continue
+                if pattern.namespace and namespace:
+                    sub_namespace = f"{namespace}:{pattern.namespace}"
                 else:
-                    namespace = pattern.namespace
+                    sub_namespace = pattern.namespace or namespace
+                stack.append(
+                    [iter(pattern.url_patterns), sub_namespace, pattern, False]
+                )
+                break
             else:
-                namespace = None
-            yield from iter_url_patterns(pattern.url_patterns, namespace, depth + 1)
+                raise TypeError(
+                    f"Unexpected pattern type: {type(pattern)} in {namespace}"
+                )
         else:
-            raise TypeError(f"Unexpected pattern type: {type(pattern)} in {namespace}")
+            stack.pop()
+            _, _, resolver, found_static = frame
+            # Remember if this resolver contains any static site paths once it has been fully traversed
+            if (
+                resolver is not None
+                and getattr(resolver, "staticsite_has_static", None) is None
+            ):
+                resolver.staticsite_has_static = found_static
+            if found_static and stack:
+                stack[-1][3] = True
 
 
 def get_header(headers: list[tuple[str, str]], name: str) -> str | None:
@@ -54,8 +93,17 @@ def get_header(headers: list[tuple[str, str]], name: str) -> str | None:
     return None
 
 
-def get_langs() -> list[str]:
-    """Returns a list of language codes for all languages configured in the project."""
+def chunked(iterable: Iterable, size: int) -> Generator[tuple]:
+    """Yields tuples of up to size items from an iterable, like itertools.batched() which requires Python 3.12."""
+    iterator = iter(iterable)
+    while chunk := tuple(islice(iterator, size)):
+        yield chunk
+
+
+@lru_cache(maxsize=1)
+def get_langs() -> tuple[str, ...]:
+    """Returns a sorted tuple of language codes for all languages configured in the project. The settings are
+    only read once, the cache is cleared if the language settings change."""
     langs = []
     language_code = str(getattr(settings, "LANGUAGE_CODE", "en"))
     global_languages = list(getattr(global_settings, "LANGUAGES", []))
@@ -74,7 +122,13 @@ def get_langs() -> list[str]:
         langs.append(language_code)
     for lang in staticsite_languages:
         langs.append(lang)
-    return list(sorted(langs))
+    return tuple(sorted(langs))
+
+
+@receiver(setting_changed)
+def clear_langs_cache(*, setting: str, **kwargs) -> None:
+    if setting in ("LANGUAGE_CODE", "LANGUAGES", "STATICSITE_LANGUAGES"):
+        get_langs.cache_clear()
 
 
 def create_test_file() -> Path:
@@ -83,3 +137,31 @@ def create_test_file() -> Path:
     temp_file.write(hexlify(os.urandom(16)))
     temp_file.close()
     return Path(temp_file.name)
+
+
+def fast_rmtree(path: Path | str) -> None:
+    """Deletes a directory tree. On POSIX systems this uses "rm -rf" which is considerably faster than
+    shutil.rmtree() for directories containing a very large number of files, shutil.rmtree() is used as a
+    fallback and on other platforms."""
+    path = Path(path)
+    rm = shutil.which("rm") if os.name == "posix" else None
+    if rm:
+        result = subprocess.run(
+            [rm, "-rf", "--", str(path)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        if result.returncode == 0 and not path.exists():
+            return
+    shutil.rmtree(path)
+
+
+@contextmanager
+def fast_temporary_directory() -> Iterator[Path]:
+    """Creates a temporary directory like tempfile.TemporaryDirectory() and deletes it on exit with
+    fast_rmtree(), generated sites can contain a very large number of files."""
+    path = Path(tempfile.mkdtemp())
+    try:
+        yield path
+    finally:
+        fast_rmtree(path)
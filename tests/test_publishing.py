@@ -1,14 +1,70 @@
+import json
 import tempfile
+from threading import Thread
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 from hashlib import sha256
-from django.test import TestCase
-from staticsite.publisher import PublisherBackendBase
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from staticsite.publisher import (
+    PublisherBackendBase,
+    check_publisher_dependencies,
+    get_publishing_targets,
+)
 from staticsite.errors import StaticSitePublishError
 
 
 class TestBackend(PublisherBackendBase):
     REQUIRED_OPTIONS = ("TEST_OPTION_1", "TEST_OPTION_2", "TEST_OPTION_3")
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.uploaded = []
+        self.deleted = []
+        self.remote_hashes = {}
+        self.final_checks_calls = 0
+
+    def get_remote_files(self) -> set[str]:
+        return set(self.remote_hashes)
+
+    def compare_file(self, local_name: Path | str, remote_name: str) -> bool:
+        local_hash = self.get_cached_local_file_hash(local_name)
+        return local_hash == self.remote_hashes[remote_name]
+
+    def upload_file(self, local_name: Path | str, remote_name: str) -> bool:
+        self.uploaded.append((local_name, remote_name))
+        return True
+
+    def delete_remote_file(self, remote_name: str) -> bool:
+        self.deleted.append(remote_name)
+        return True
+
+    def final_checks(self) -> None:
+        self.final_checks_calls += 1
+
+
+class TestHTTPRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        TestHTTPRequestHandler.connections += 1
+
+    def do_GET(self):
+        if self.path.startswith("/test.txt?"):
+            self.send_response(200)
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"test")
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
 
 class StaticSitePublishingTestSuite(TestCase):
     def setUp(self):
@@ -27,6 +83,170 @@ class StaticSitePublishingTestSuite(TestCase):
         with self.assertRaises(StaticSitePublishError):
             TestBackend(Path("/tmp/does/not/exist"), options=self.test_options)
 
+    def test_upload_test_file(self):
+        test_backend = TestBackend("/tmp", options=self.test_options)
+        test_backend.upload_test_file("/tmp/test.txt")
+        self.assertEqual(test_backend.uploaded, [("/tmp/test.txt", "/test.txt")])
+        # The upload is waited on so the test file can be verified straight away
+        self.assertEqual(test_backend.final_checks_calls, 1)
+
+    def test_publish_concurrency(self):
+        test_backend = TestBackend("/tmp", options=self.test_options)
+        self.assertEqual(test_backend.publish_concurrency(), 1)
+        options = dict(self.test_options, PUBLISH_CONCURRENCY="8")
+        test_backend = TestBackend("/tmp", options=options)
+        self.assertEqual(test_backend.publish_concurrency(), 8)
+
+    def test_bulk_delete(self):
+        test_backend = TestBackend("/tmp", options=self.test_options)
+        remote_names = [f"/{i}.html" for i in range(10)]
+        test_backend.bulk_delete(remote_names, max_workers=4)
+        self.assertEqual(sorted(test_backend.deleted), sorted(remote_names))
+
+    def test_check_publisher_dependencies(self):
+        module = check_publisher_dependencies("test", "hashlib")
+        self.assertIs(module.sha256, sha256)
+        self.assertIs(check_publisher_dependencies("test", "hashlib", "sha256"), sha256)
+        with self.assertRaises(ImportError):
+            check_publisher_dependencies("test", "hashlib", "does_not_exist")
+
+    def test_publish(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            tmpdirpath = Path(tmpdirname)
+            (tmpdirpath / "fresh.txt").write_bytes(b"test")
+            (tmpdirpath / "stale.txt").write_bytes(b"test")
+            (tmpdirpath / "new.txt").write_bytes(b"test")
+            test_backend = TestBackend(tmpdirname, options=self.test_options)
+            test_backend._authenticated = True
+            test_backend.remote_hashes = {
+                "/fresh.txt": "098f6bcd4621d373cade4e832627b4f6",
+                "/stale.txt": "00000000000000000000000000000000",
+                "/deleted.txt": "098f6bcd4621d373cade4e832627b4f6",
+            }
+            test_backend.publish(verify=False, concurrency=4)
+            self.assertEqual(
+                sorted(test_backend.uploaded),
+                [
+                    (str(tmpdirpath / "new.txt"), "/new.txt"),
+                    (str(tmpdirpath / "stale.txt"), "/stale.txt"),
+                ],
+            )
+            self.assertEqual(test_backend.deleted, ["/deleted.txt"])
+
+    def test_apublish(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            tmpdirpath = Path(tmpdirname)
+            (tmpdirpath / "new.txt").write_bytes(b"test")
+            test_backend = TestBackend(tmpdirname, options=self.test_options)
+            test_backend._authenticated = True
+            self.assertTrue(async_to_sync(test_backend.apublish)(verify=False))
+            self.assertEqual(
+                test_backend.uploaded, [(str(tmpdirpath / "new.txt"), "/new.txt")]
+            )
+
+    def test_publish_hash_manifest(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            tmpdirpath = Path(tmpdirname) / "site"
+            tmpdirpath.mkdir()
+            (tmpdirpath / "fresh.txt").write_bytes(b"test")
+            manifest_file = Path(tmpdirname) / "manifest.json"
+            options = dict(self.test_options, HASH_MANIFEST=str(manifest_file))
+            test_backend = TestBackend(tmpdirpath, options=options)
+            test_backend._authenticated = True
+            test_backend.remote_hashes = {
+                "/fresh.txt": "098f6bcd4621d373cade4e832627b4f6",
+            }
+            test_backend.publish(verify=False)
+            manifest = json.loads(manifest_file.read_text())
+            self.assertEqual(
+                manifest["/fresh.txt"][1], "098f6bcd4621d373cade4e832627b4f6"
+            )
+            # Unchanged files use the hash from the manifest rather than being hashed again
+            manifest["/fresh.txt"][1] = "00000000000000000000000000000000"
+            manifest_file.write_text(json.dumps(manifest))
+            test_backend = TestBackend(tmpdirpath, options=options)
+            test_backend._authenticated = True
+            test_backend.remote_hashes = {
+                "/fresh.txt": "00000000000000000000000000000000",
+            }
+            test_backend.publish(verify=False)
+            self.assertEqual(test_backend.uploaded, [])
+            # Changed files are hashed again
+            (tmpdirpath / "fresh.txt").write_bytes(b"changed")
+            test_backend = TestBackend(tmpdirpath, options=options)
+            test_backend._authenticated = True
+            test_backend.remote_hashes = {
+                "/fresh.txt": "00000000000000000000000000000000",
+            }
+            test_backend.publish(verify=False)
+            self.assertEqual(
+                test_backend.uploaded, [(str(tmpdirpath / "fresh.txt"), "/fresh.txt")]
+            )
+
+    def test_publish_files(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            tmpdirpath = Path(tmpdirname)
+            test_backend = TestBackend(tmpdirname, options=self.test_options)
+            test_backend._authenticated = True
+
+            def generate_files():
+                for i in range(5):
+                    file_path = tmpdirpath / f"{i}.txt"
+                    file_path.write_bytes(b"test")
+                    yield file_path
+                # Files written but not yielded are found when the directory is indexed
+                (tmpdirpath / "unyielded.txt").write_bytes(b"test")
+
+            test_backend.publish(verify=False, concurrency=2, files=generate_files())
+            # Yielded files are uploaded as Path objects, indexed files as str paths
+            expected = [(tmpdirpath / f"{i}.txt", f"/{i}.txt") for i in range(5)]
+            expected.append((str(tmpdirpath / "unyielded.txt"), "/unyielded.txt"))
+            self.assertEqual(
+                sorted(test_backend.uploaded, key=str), sorted(expected, key=str)
+            )
+
+    def test_publish_files_without_indexing(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            tmpdirpath = Path(tmpdirname)
+            (tmpdirpath / "yielded.txt").write_bytes(b"test")
+            (tmpdirpath / "unyielded.txt").write_bytes(b"test")
+            test_backend = TestBackend(tmpdirname, options=self.test_options)
+            test_backend._authenticated = True
+            test_backend.publish(
+                verify=False, files=[tmpdirpath / "yielded.txt"], index_local=False
+            )
+            self.assertEqual(
+                test_backend.uploaded, [(tmpdirpath / "yielded.txt", "/yielded.txt")]
+            )
+
+    def test_get_publishing_targets(self):
+        self.assertIn("test-s3-container", get_publishing_targets())
+        test_targets = {"other-target": {"ENGINE": "test"}}
+        with override_settings(STATICSITE_PUBLISHING_TARGETS=test_targets):
+            self.assertEqual(get_publishing_targets(), test_targets)
+        self.assertIn("test-s3-container", get_publishing_targets())
+
+    def test_get_url_hash(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), TestHTTPRequestHandler)
+        server.daemon_threads = True
+        Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            test_backend = TestBackend("/tmp", options=self.test_options)
+            base_url = f"http://127.0.0.1:{server.server_port}"
+            TestHTTPRequestHandler.connections = 0
+            for _ in range(3):
+                self.assertEqual(
+                    test_backend.get_url_hash(f"{base_url}/test.txt"),
+                    "098f6bcd4621d373cade4e832627b4f6",
+                )
+            self.assertFalse(test_backend.get_url_hash(f"{base_url}/missing.txt"))
+            # The connection is kept alive and reused for every request
+            self.assertEqual(TestHTTPRequestHandler.connections, 1)
+            test_backend.close_http_connections()
+        finally:
+            server.shutdown()
+            server.server_close()
+
     def test_validate_options(self):
         TestBackend("/tmp", options=self.test_options)
         with self.assertRaises(StaticSitePublishError):
@@ -49,11 +269,11 @@ class StaticSitePublishingTestSuite(TestCase):
                 with tempfile.NamedTemporaryFile(dir=tmpsubdirname) as tmpfilename:
                     test_backend = TestBackend(tmpdirname, options=self.test_options)
                     test_backend.index_local_files()
+                    self.assertEqual(test_backend.get_local_dirs(), [tmpsubdirname])
+                    self.assertEqual(test_backend.get_local_files(), [tmpfilename.name])
                     self.assertEqual(
-                        test_backend.get_local_dirs(), {Path(tmpsubdirname)}
-                    )
-                    self.assertEqual(
-                        test_backend.get_local_files(), {Path(tmpfilename.name)}
+                        test_backend.remote_path(tmpfilename.name),
+                        test_backend.remote_path(Path(tmpfilename.name)),
                     )
 
     def test_get_local_file_hash(self):
@@ -72,6 +292,22 @@ class StaticSitePublishingTestSuite(TestCase):
                     "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
                 )
 
+    def test_get_cached_local_file_hash(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            with tempfile.NamedTemporaryFile(dir=tmpdirname) as tmpfilename:
+                test_backend = TestBackend(tmpdirname, options=self.test_options)
+                tmpfilename.write(b"test")
+                tmpfilename.flush()
+                local_hash = test_backend.get_cached_local_file_hash(tmpfilename.name)
+                self.assertEqual(local_hash, "098f6bcd4621d373cade4e832627b4f6")
+                # Changing the file does not change the cached hash
+                tmpfilename.write(b"changed")
+                tmpfilename.flush()
+                local_hash = test_backend.get_cached_local_file_hash(
+                    Path(tmpfilename.name)
+                )
+                self.assertEqual(local_hash, "098f6bcd4621d373cade4e832627b4f6")
+
     def test_file_exists(self):
         with tempfile.TemporaryDirectory() as tmpdirname:
             with tempfile.NamedTemporaryFile(dir=tmpdirname) as tmpfilename:
@@ -91,6 +327,18 @@ class StaticSitePublishingTestSuite(TestCase):
                     test_backend.detect_local_file_mimetype(tmpfilename.name),
                     "text/plain",
                 )
+        test_backend = TestBackend("/tmp", options=self.test_options)
+        self.assertEqual(
+            test_backend.detect_local_file_mimetype("/tmp/test.HTML"), "text/html"
+        )
+        self.assertEqual(
+            test_backend.detect_local_file_mimetype(Path("/tmp/test.pdf")),
+            "application/pdf",
+        )
+        self.assertEqual(
+            test_backend.detect_local_file_mimetype("/tmp/test.unknown", "test/test"),
+            "test/test",
+        )
 
     def test_generate_remote_url(self):
         with tempfile.TemporaryDirectory() as tmpdirname:
@@ -105,3 +353,9 @@ class StaticSitePublishingTestSuite(TestCase):
                     test_backend.generate_remote_url(Path(tmpfilename.name)),
                     f"{self.test_options['PUBLIC_URL']}{tmpfilepath.name}",
                 )
+        options = dict(self.test_options, PUBLIC_URL="https://test.cdn.example/site/")
+        test_backend = TestBackend("/tmp", options=options)
+        self.assertEqual(
+            test_backend.generate_remote_url("/tmp/dir/test.html"),
+            "https://test.cdn.example/site/dir/test.html",
+        )
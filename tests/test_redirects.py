@@ -4,7 +4,11 @@ from tempfile import TemporaryDirectory
 from django.test import TestCase
 from django.apps import apps as django_apps
 from django.contrib.redirects.models import Redirect
-from staticsite.renderer import render_static_redirect, render_redirects
+from staticsite.renderer import (
+    render_static_redirect,
+    render_redirects,
+    iter_render_redirects,
+)
 
 
 class StaticSiteRedirectsTestSuite(TestCase):
@@ -56,6 +60,13 @@ class StaticSiteRedirectsTestSuite(TestCase):
             "</html>"
         )
         self.assertEqual(test_template, expected_template.encode())
+        # Destination URLs are HTML escaped
+        test_template = render_static_redirect('https://example.com/?a=1&b="2"')
+        self.assertIn(
+            b'content="0;URL=https://example.com/?a=1&amp;b=&quot;2&quot;"',
+            test_template,
+        )
+        self.assertNotIn(b"{u}", test_template)
 
     def test_redirects(self):
         with TemporaryDirectory() as tempdir:
@@ -72,3 +83,10 @@ class StaticSiteRedirectsTestSuite(TestCase):
                     test_file_contents = f.read()
                     expected_file_contents = render_static_redirect(redirect.new_path)
                     self.assertEqual(test_file_contents, expected_file_contents)
+
+    def test_iter_render_redirects(self):
+        with TemporaryDirectory() as tempdir:
+            rendered = list(iter_render_redirects(tempdir))
+            self.assertEqual(len(rendered), Redirect.objects.count())
+            for rendered_path in rendered:
+                self.assertTrue(rendered_path.is_file())
@@ -1,13 +1,31 @@
+import os
 import tempfile
+from multiprocessing import get_all_start_methods
 from pathlib import Path
-from django.test import TransactionTestCase
+from django.test import TransactionTestCase, override_settings
 from django.conf import settings
+from django.db import transaction
 from django.contrib.flatpages.models import FlatPage
 from django.apps import apps as django_apps
 from django.utils.translation import activate as activate_lang
 from staticsite.urls import get_staticsite_urls, get_staticsite_url_by_name
-from staticsite.request import get_uri_values, generate_uri
-from staticsite.renderer import StaticSiteRenderer, render_uri, write_single_pattern
+from staticsite.request import (
+    get_application,
+    get_uri_values,
+    generate_uri,
+    generate_filename,
+    get_static_filepath,
+)
+from staticsite.utils import fast_rmtree, iter_url_patterns
+from staticsite.renderer import (
+    AsyncFileWriter,
+    StaticSiteRenderer,
+    render_uri,
+    get_render_langs,
+    render_uri_to_file,
+    write_file,
+    write_single_pattern,
+)
 from staticsite.errors import StaticSiteError
 
 
@@ -18,6 +36,54 @@ test_urls_not_broken = [
     p for p in test_urls if not getattr(p.callback, "skip_render_all_tests", False)
 ]
 
+# Files written when rendering all of the test urls which are not broken views
+rendered_files = (
+    ("path", "namespace1", "path", "sub-namespace", "sub-url-in-sub-namespace"),
+    ("path", "namespace1", "sub-url-in-namespace"),
+    ("path", "no-namespace", "sub-url-in-no-namespace"),
+    ("en", "path", "i18n", "sub-url-with-i18n-prefix"),
+    ("re_path", "no-param"),
+    ("re_path", "no-func"),
+    ("re_path", "positional-param", "12345"),
+    ("re_path", "positional-param", "67890"),
+    ("re_path", "x", "12345.html"),
+    ("re_path", "x", "67890.html"),
+    ("re_path", "named-override-filename", "test"),
+    ("re_path", "x", "test.html"),
+    ("re_path", "ignore-sessions"),
+    ("re_path", "flatpage", "flat", "page1.html"),
+    ("re_path", "flatpage", "flat", "page2.html"),
+    ("path", "no-param"),
+    ("path", "no-func"),
+    ("path", "positional-param", "12345"),
+    ("path", "positional-param", "67890"),
+    ("path", "x", "12345.html"),
+    ("path", "x", "67890.html"),
+    ("path", "named-param", "test"),
+    ("path", "x", "test.html"),
+    ("path", "ignore-sessions"),
+    ("path", "flatpage", "flat", "page1.html"),
+    ("path", "flatpage", "flat", "page2.html"),
+    ("path", "sitemap"),
+    ("path", "kwargs"),
+    ("path", "humanize"),
+    ("path", "has-resolver-match"),
+)
+
+
+def get_written_files(directory: Path) -> set[Path]:
+    """Returns the paths of all files written to a directory tree."""
+    written_files = set()
+    to_scan = [directory]
+    while to_scan:
+        with os.scandir(to_scan.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    to_scan.append(entry.path)
+                else:
+                    written_files.add(Path(entry.path))
+    return written_files
+
 
 class StaticSiteRendererTestSuite(TransactionTestCase):
     def setUp(self):
@@ -29,15 +95,24 @@ class StaticSiteRendererTestSuite(TransactionTestCase):
         page1.title = "flatpage1"
         page1.content = "flatpage1"
         page1.template_name = "flatpage.html"
-        page1.save()
-        page1.sites.add(current_site)
         page2 = FlatPage()
         page2.url = "/flat/page2.html"
         page2.title = "flatpage2"
         page2.content = "flatpage2"
         page2.template_name = "flatpage.html"
-        page2.save()
-        page2.sites.add(current_site)
+        FlatPage.objects.bulk_create([page1, page2])
+        FlatPageSite = FlatPage.sites.through
+        FlatPageSite.objects.bulk_create(
+            [
+                FlatPageSite(flatpage=page1, site=current_site),
+                FlatPageSite(flatpage=page2, site=current_site),
+            ]
+        )
+
+    def assert_rendered_files(self, tmpdirname: str, expected_files: tuple) -> None:
+        written_files = get_written_files(Path(tmpdirname))
+        for expected_file in expected_files:
+            self.assertIn(Path(tmpdirname, *expected_file), written_files)
 
     def test_get_uri_values(self):
         test = ()
@@ -58,41 +133,59 @@ class StaticSiteRendererTestSuite(TransactionTestCase):
         check = get_uri_values(lambda: test, None)
         self.assertEqual(check, test)
         for invalid in ("a", 1, b"a", {"s"}, {"a": "a"}, object()):
-            with self.assertRaises(StaticSiteError):
-                get_uri_values(lambda: invalid, None)
+            with self.subTest(value=invalid):
+                with self.assertRaises(StaticSiteError):
+                    get_uri_values(lambda: invalid, None)
 
-    def test_re_path_no_param(self):
-        u = get_staticsite_url_by_name("re_path-no-param")
-        self.assertEqual(u.name, "re_path-no-param")
-        param_set = get_uri_values(u.staticsite_urls_generator, u.name)[0]
-        uri = generate_uri(u.staticsite_namespace, u.name, param_set)
-        self.assertEqual(uri, "/re_path/no-param")
-        status, headers, body = render_uri(uri, u.staticsite_status_codes)
-        self.assertEqual(status, 200)
-        self.assertEqual(body, b"test")
-
-    def test_re_path_positional_param(self):
-        u = get_staticsite_url_by_name("re_path-positional-param")
-        self.assertEqual(u.name, "re_path-positional-param")
-        param_sets = get_uri_values(u.staticsite_urls_generator, u.name)
-        for param_set in param_sets:
-            param_set = (param_set,)
-            first_value = param_set[0]
-            uri = generate_uri(u.staticsite_namespace, u.name, param_set)
-            self.assertEqual(uri, f"/re_path/positional-param/{first_value}")
-            status, headers, body = render_uri(uri, u.staticsite_status_codes)
-            self.assertEqual(status, 200)
-            self.assertEqual(body, b"test" + first_value.encode())
+    def test_iter_static_url_patterns(self):
+        static_patterns = list(iter_url_patterns(static_only=True))
+        self.assertEqual([p for p, _, _ in static_patterns], test_urls)
+        namespaces = {p.name: namespace for p, namespace, _ in static_patterns}
+        self.assertEqual(namespaces["path-no-param"], None)
+        self.assertEqual(namespaces["test_url_in_no_namespace"], None)
+        self.assertEqual(namespaces["test_url_in_namespace"], "test_namespace")
+        self.assertEqual(
+            namespaces["test_url_in_sub_namespace"],
+            "test_namespace:sub_test_namespace",
+        )
 
-    def test_re_path_named_param(self):
-        u = get_staticsite_url_by_name("re_path-named-param")
-        self.assertEqual(u.name, "re_path-named-param")
-        param_set = get_uri_values(u.staticsite_urls_generator, u.name)[0]
-        uri = generate_uri(u.staticsite_namespace, u.name, param_set)
-        self.assertEqual(uri, "/re_path/named-override-filename/test")
-        status, headers, body = render_uri(uri, u.staticsite_status_codes)
-        self.assertEqual(status, 200)
-        self.assertEqual(body, b"testtest")
+    def test_path_and_re_path_params(self):
+        # Each URL is defined with both path() and re_path()
+        for prefix in ("path", "re_path"):
+            named_param_path = (
+                "named-param" if prefix == "path" else "named-override-filename"
+            )
+            cases = (
+                (f"{prefix}-no-param", f"/{prefix}/no-param", b"test"),
+                (
+                    f"{prefix}-named-param",
+                    f"/{prefix}/{named_param_path}/test",
+                    b"testtest",
+                ),
+            )
+            for name, expected_uri, expected_body in cases:
+                with self.subTest(name=name):
+                    u = get_staticsite_url_by_name(name)
+                    self.assertEqual(u.name, name)
+                    param_set = get_uri_values(u.staticsite_urls_generator, u.name)[0]
+                    uri = generate_uri(u.staticsite_namespace, u.name, param_set)
+                    self.assertEqual(uri, expected_uri)
+                    status, headers, body = render_uri(uri, u.staticsite_status_codes)
+                    self.assertEqual(status, 200)
+                    self.assertEqual(body, expected_body)
+            name = f"{prefix}-positional-param"
+            with self.subTest(name=name):
+                u = get_staticsite_url_by_name(name)
+                self.assertEqual(u.name, name)
+                param_sets = get_uri_values(u.staticsite_urls_generator, u.name)
+                for param_set in param_sets:
+                    param_set = (param_set,)
+                    first_value = param_set[0]
+                    uri = generate_uri(u.staticsite_namespace, u.name, param_set)
+                    self.assertEqual(uri, f"/{prefix}/positional-param/{first_value}")
+                    status, headers, body = render_uri(uri, u.staticsite_status_codes)
+                    self.assertEqual(status, 200)
+                    self.assertEqual(body, b"test" + first_value.encode())
 
     def test_re_broken(self):
         u = get_staticsite_url_by_name("re_path-broken")
@@ -104,39 +197,6 @@ class StaticSiteRendererTestSuite(TransactionTestCase):
             status, headers, body = render_uri(uri, u.staticsite_status_codes)
             self.assertEqual(status, 500)
 
-    def test_path_no_param(self):
-        u = get_staticsite_url_by_name("path-no-param")
-        self.assertEqual(u.name, "path-no-param")
-        param_set = get_uri_values(u.staticsite_urls_generator, u.name)[0]
-        uri = generate_uri(u.staticsite_namespace, u.name, param_set)
-        self.assertEqual(uri, "/path/no-param")
-        status, headers, body = render_uri(uri, u.staticsite_status_codes)
-        self.assertEqual(status, 200)
-        self.assertEqual(body, b"test")
-
-    def test_path_positional_param(self):
-        u = get_staticsite_url_by_name("path-positional-param")
-        self.assertEqual(u.name, "path-positional-param")
-        param_sets = get_uri_values(u.staticsite_urls_generator, u.name)
-        for param_set in param_sets:
-            param_set = (param_set,)
-            first_value = param_set[0]
-            uri = generate_uri(u.staticsite_namespace, u.name, param_set)
-            self.assertEqual(uri, f"/path/positional-param/{first_value}")
-            status, headers, body = render_uri(uri, u.staticsite_status_codes)
-            self.assertEqual(status, 200)
-            self.assertEqual(body, b"test" + first_value.encode())
-
-    def test_path_named_param(self):
-        u = get_staticsite_url_by_name("path-named-param")
-        self.assertEqual(u.name, "path-named-param")
-        param_set = get_uri_values(u.staticsite_urls_generator, u.name)[0]
-        uri = generate_uri(u.staticsite_namespace, u.name, param_set)
-        self.assertEqual(uri, "/path/named-param/test")
-        status, headers, body = render_uri(uri, u.staticsite_status_codes)
-        self.assertEqual(status, 200)
-        self.assertEqual(body, b"testtest")
-
     def test_path_broken(self):
         u = get_staticsite_url_by_name("path-broken")
         self.assertEqual(u.name, "path-broken")
@@ -148,49 +208,21 @@ class StaticSiteRendererTestSuite(TransactionTestCase):
             self.assertEqual(status, 500)
 
     def test_render_paths(self):
-        expected_files = (
-            ("path", "namespace1", "path", "sub-namespace", "sub-url-in-sub-namespace"),
-            ("path", "namespace1", "sub-url-in-namespace"),
-            ("path", "no-namespace", "sub-url-in-no-namespace"),
-            ("en", "path", "i18n", "sub-url-with-i18n-prefix"),
-            ("re_path", "no-param"),
-            ("re_path", "no-func"),
-            ("re_path", "positional-param", "12345"),
-            ("re_path", "positional-param", "67890"),
-            ("re_path", "x", "12345.html"),
-            ("re_path", "x", "67890.html"),
-            ("re_path", "named-override-filename", "test"),
-            ("re_path", "x", "test.html"),
-            ("re_path", "ignore-sessions"),
-            ("re_path", "flatpage", "flat", "page1.html"),
-            ("re_path", "flatpage", "flat", "page2.html"),
-            ("path", "no-param"),
-            ("path", "no-func"),
-            ("path", "positional-param", "12345"),
-            ("path", "positional-param", "67890"),
-            ("path", "x", "12345.html"),
-            ("path", "x", "67890.html"),
-            ("path", "named-param", "test"),
-            ("path", "x", "test.html"),
-            ("path", "ignore-sessions"),
-            ("path", "flatpage", "flat", "page1.html"),
-            ("path", "flatpage", "flat", "page2.html"),
-            ("path", "sitemap"),
-            ("path", "kwargs"),
-            ("path", "humanize"),
-            ("path", "has-resolver-match"),
-        )
         with tempfile.TemporaryDirectory() as tmpdirname:
             with StaticSiteRenderer(test_urls_not_broken) as renderer:
                 renderer.render_to_directory(tmpdirname)
-            written_files = []
-            tmpdirpath = Path(tmpdirname)
-            for root, dirs, files in tmpdirpath.walk():
-                for f in files:
-                    written_files.append(root / f)
-            for expected_file in expected_files:
-                filepath = tmpdirpath / Path(*expected_file)
-                self.assertIn(filepath, written_files)
+            self.assert_rendered_files(tmpdirname, rendered_files)
+
+    def test_iter_render_to_directory(self):
+        # Rendered in this process and, where fork is available, by a pool of render processes
+        for concurrency in (1, max(2, os.cpu_count() or 1)):
+            with tempfile.TemporaryDirectory() as tmpdirname:
+                with StaticSiteRenderer(
+                    test_urls_not_broken, concurrency=concurrency
+                ) as renderer:
+                    yielded_files = list(renderer.iter_render_to_directory(tmpdirname))
+                written_files = get_written_files(Path(tmpdirname))
+                self.assertEqual(set(yielded_files), written_files)
 
     def test_sessions_are_ignored(self):
         u = get_staticsite_url_by_name("path-ignore-sessions")
@@ -254,14 +286,7 @@ class StaticSiteRendererTestSuite(TransactionTestCase):
         with tempfile.TemporaryDirectory() as tmpdirname:
             write_single_pattern(tmpdirname, "path-positional-param", 12345)
             write_single_pattern(tmpdirname, "path-named-param", param="test")
-            written_files = []
-            tmpdirpath = Path(tmpdirname)
-            for root, dirs, files in tmpdirpath.walk():
-                for f in files:
-                    written_files.append(root / f)
-            for expected_file in expected_files:
-                filepath = tmpdirpath / Path(*expected_file)
-                self.assertIn(filepath, written_files)
+            self.assert_rendered_files(tmpdirname, expected_files)
 
     def test_i18n(self):
         settings.STATICSITE_LANGUAGES = [
@@ -274,13 +299,7 @@ class StaticSiteRendererTestSuite(TransactionTestCase):
             expected[lang_code] = f"/{lang_code}/path/i18n/sub-url-with-i18n-prefix"
         u = get_staticsite_url_by_name("test-url-i18n", namespace="test_i18n")
         self.assertEqual(u.name, "test-url-i18n")
-        for lang_code, path in expected.items():
-            activate_lang(lang_code)
-            param_set = get_uri_values(u.staticsite_urls_generator, u.name)[0]
-            uri = generate_uri(u.staticsite_namespace, u.name, param_set)
-            self.assertEqual(uri, path)
-            status, headers, body = render_uri(uri, u.staticsite_status_codes)
-            self.assertEqual(body, b"test")
+        self.assertIs(get_staticsite_url_by_name("test_i18n:test-url-i18n"), u)
         # Render the test URLs and confirm the expected language URI prefixes are present
         expected_files = (
             ("en", "path", "i18n", "sub-url-with-i18n-prefix"),
@@ -288,18 +307,17 @@ class StaticSiteRendererTestSuite(TransactionTestCase):
             ("de", "path", "i18n", "sub-url-with-i18n-prefix"),
         )
         with tempfile.TemporaryDirectory() as tmpdirname:
-            for lang_code in settings.STATICSITE_LANGUAGES:
+            for lang_code, path in expected.items():
+                activate_lang(lang_code)
+                param_set = get_uri_values(u.staticsite_urls_generator, u.name)[0]
+                uri = generate_uri(u.staticsite_namespace, u.name, param_set)
+                self.assertEqual(uri, path)
+                status, headers, body = render_uri(uri, u.staticsite_status_codes)
+                self.assertEqual(body, b"test")
                 write_single_pattern(
                     tmpdirname, "test_i18n:test-url-i18n", language_code=lang_code
                 )
-            written_files = []
-            tmpdirpath = Path(tmpdirname)
-            for root, dirs, files in tmpdirpath.walk():
-                for f in files:
-                    written_files.append(root / f)
-            for expected_file in expected_files:
-                filepath = tmpdirname / Path(*expected_file)
-                self.assertIn(filepath, written_files)
+            self.assert_rendered_files(tmpdirname, expected_files)
         settings.STATICSITE_LANGUAGES = []
 
     def test_kwargs(self):
@@ -341,50 +359,28 @@ class StaticSiteRendererTestSuite(TransactionTestCase):
         status, headers, body = render_uri(uri, u.staticsite_status_codes)
         self.assertEqual(body, b"test_request_has_resolver_match_view")
 
+    def test_render_uri_to_file(self):
+        u = get_staticsite_url_by_name("test-has-resolver-match")
+        param_set = get_uri_values(u.staticsite_urls_generator, u.name)[0]
+        uri = generate_uri(u.staticsite_namespace, u.name, param_set)
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            full_path = Path(tmpdirname) / "dir" / "index.html"
+            status, headers, size = render_uri_to_file(
+                uri, u.staticsite_status_codes, full_path
+            )
+            self.assertEqual(status, 200)
+            self.assertEqual(
+                full_path.read_bytes(), b"test_request_has_resolver_match_view"
+            )
+            self.assertEqual(size, full_path.stat().st_size)
+
     def test_parallel_rendering(self):
-        expected_files = (
-            ("path", "namespace1", "path", "sub-namespace", "sub-url-in-sub-namespace"),
-            ("path", "namespace1", "sub-url-in-namespace"),
-            ("path", "no-namespace", "sub-url-in-no-namespace"),
-            ("en", "path", "i18n", "sub-url-with-i18n-prefix"),
-            ("re_path", "no-param"),
-            ("re_path", "no-func"),
-            ("re_path", "positional-param", "12345"),
-            ("re_path", "positional-param", "67890"),
-            ("re_path", "x", "12345.html"),
-            ("re_path", "x", "67890.html"),
-            ("re_path", "named-override-filename", "test"),
-            ("re_path", "x", "test.html"),
-            ("re_path", "ignore-sessions"),
-            ("re_path", "flatpage", "flat", "page1.html"),
-            ("re_path", "flatpage", "flat", "page2.html"),
-            ("path", "no-param"),
-            ("path", "no-func"),
-            ("path", "positional-param", "12345"),
-            ("path", "positional-param", "67890"),
-            ("path", "x", "12345.html"),
-            ("path", "x", "67890.html"),
-            ("path", "named-param", "test"),
-            ("path", "x", "test.html"),
-            ("path", "ignore-sessions"),
-            ("path", "flatpage", "flat", "page1.html"),
-            ("path", "flatpage", "flat", "page2.html"),
-            ("path", "sitemap"),
-            ("path", "kwargs"),
-            ("path", "humanize"),
-            ("path", "has-resolver-match"),
-        )
         with tempfile.TemporaryDirectory() as tmpdirname:
             with StaticSiteRenderer(test_urls_not_broken, concurrency=8) as renderer:
+                if "fork" in get_all_start_methods():
+                    self.assertTrue(renderer.use_processes())
                 renderer.render_to_directory(tmpdirname)
-            written_files = []
-            tmpdirpath = Path(tmpdirname)
-            for root, dirs, files in tmpdirpath.walk():
-                for f in files:
-                    written_files.append(root / f)
-            for expected_file in expected_files:
-                filepath = tmpdirpath / Path(*expected_file)
-                self.assertIn(filepath, written_files)
+            self.assert_rendered_files(tmpdirname, rendered_files)
 
     def test_generate_urls(self):
         expected_urls = (
@@ -424,3 +420,102 @@ class StaticSiteRendererTestSuite(TransactionTestCase):
             for generated_url in renderer.urls():
                 generated_urls.append(generated_url)
         self.assertEqual(sorted(generated_urls), sorted(expected_urls))
+
+    def test_get_application(self):
+        application = get_application()
+        self.assertIs(get_application(), application)
+        with override_settings(MIDDLEWARE=[]):
+            self.assertIsNot(get_application(), application)
+
+    @override_settings(DEBUG=False)
+    def test_renderer_debug(self):
+        with StaticSiteRenderer(test_urls_not_broken):
+            self.assertFalse(settings.DEBUG)
+            self.assertEqual(settings.ALLOWED_HOSTS, ["*"])
+        with StaticSiteRenderer(test_urls_not_broken, enable_debug=True):
+            self.assertTrue(settings.DEBUG)
+        self.assertFalse(settings.DEBUG)
+
+    def test_thread_executor_reused(self):
+        # Inside a transaction renders use threads rather than forked processes
+        urls = [
+            get_staticsite_url_by_name("path-no-param"),
+            get_staticsite_url_by_name("path-positional-param"),
+        ]
+        with transaction.atomic():
+            with StaticSiteRenderer(urls, concurrency=2) as renderer:
+                self.assertFalse(renderer.use_processes())
+                first_render = [r[1] for r in renderer.render()]
+                executor = renderer._thread_executor
+                self.assertIsNotNone(executor)
+                self.assertEqual([r[1] for r in renderer.render()], first_render)
+                self.assertIs(renderer._thread_executor, executor)
+            self.assertIsNone(renderer._thread_executor)
+
+    def test_write_file(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            full_path = Path(tmpdirname) / "a" / "b" / "test.html"
+            self.assertEqual(write_file(full_path, b"test"), 4)
+            self.assertEqual(full_path.read_bytes(), b"test")
+            self.assertEqual(write_file(full_path, [b"te", b"st2"]), 5)
+            self.assertEqual(full_path.read_bytes(), b"test2")
+            # A known directory which has since been removed is created again
+            fast_rmtree(Path(tmpdirname) / "a")
+            self.assertEqual(write_file(full_path, b"test"), 4)
+            self.assertEqual(full_path.read_bytes(), b"test")
+
+    def test_generate_filename(self):
+        self.assertEqual(generate_filename("x/{0}.html", "/x", ("1",)), "x/1.html")
+        self.assertEqual(
+            generate_filename("x/{param}.html", "/x", {"param": "a"}), "x/a.html"
+        )
+        self.assertEqual(
+            generate_filename("x/plain.html", "/x", ("1",)), "x/plain.html"
+        )
+        self.assertEqual(generate_filename(None, "/x/", ()), "x/index.html")
+        self.assertIsNone(generate_filename(None, "/x", ()))
+
+    def test_generate_uri_cache(self):
+        u = get_staticsite_url_by_name("path-positional-param")
+        uri = generate_uri(u.staticsite_namespace, u.name, ("12345",))
+        self.assertEqual(uri, generate_uri(u.staticsite_namespace, u.name, ["12345"]))
+        # Unhashable parameters are reversed without caching
+        self.assertIn(
+            "12345", generate_uri(u.staticsite_namespace, u.name, (["12345"],))
+        )
+
+    def test_async_file_writer(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            tmpdirpath = Path(tmpdirname)
+            with AsyncFileWriter(maxsize=2) as writer:
+                for i in range(5):
+                    writer.write(tmpdirpath / "dir" / f"{i}.html", b"test")
+            for i in range(5):
+                self.assertEqual(
+                    (tmpdirpath / "dir" / f"{i}.html").read_bytes(), b"test"
+                )
+            # Errors writing files are raised in the thread using the writer
+            (tmpdirpath / "file").write_bytes(b"test")
+            with self.assertRaises(OSError):
+                with AsyncFileWriter() as writer:
+                    writer.write(tmpdirpath / "file" / "test.html", b"test")
+
+    def test_get_static_filepath(self):
+        output_dir = Path("/tmp/output")
+        self.assertEqual(
+            get_static_filepath(output_dir, "x/test.html", "/x"),
+            (output_dir / "x" / "test.html", "x/test.html"),
+        )
+        self.assertEqual(
+            get_static_filepath(output_dir, None, "/path/page.html"),
+            (output_dir / "path" / "page.html", "/path/page.html"),
+        )
+
+    @override_settings(STATICSITE_LANGUAGES=["en", "fr", "de"])
+    def test_get_render_langs(self):
+        # Language prefixed URLs are rendered in every language
+        u = get_staticsite_url_by_name("test-url-i18n", namespace="test_i18n")
+        self.assertEqual(get_render_langs(u, ()), ["de", "en", "fr"])
+        # Other URLs are the same in every language so are only rendered once
+        u = get_staticsite_url_by_name("path-positional-param")
+        self.assertEqual(get_render_langs(u, ("12345",)), ["fr"])
@@ -1,9 +1,17 @@
 import os
 from pathlib import Path
+from shutil import SameFileError
 from tempfile import TemporaryDirectory
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.conf import settings
-from staticsite.static import copy_static_and_media_files
+from staticsite.static import (
+    copy_file,
+    copy_static,
+    copy_static_and_media_files,
+    get_copy_workers,
+    link_file,
+    iter_copy_static_and_media_files,
+)
 
 
 class StaticSiteStaticTestSuite(TestCase):
@@ -39,3 +47,79 @@ class StaticSiteStaticTestSuite(TestCase):
                 Path(tempdir) / "static" / "appdir" / "appdir-test.txt"
             )
             self.assertFalse(os.path.exists(test_appdir_file_path))
+
+    def test_iter_copy_static_and_media_files(self):
+        with TemporaryDirectory() as tempdir:
+            tempdir = Path(tempdir)
+            copied = list(iter_copy_static_and_media_files(tempdir))
+            self.assertIn(tempdir / "media" / "media-test.txt", copied)
+            self.assertIn(tempdir / "static" / "static-test.txt", copied)
+            # Every copied file is yielded
+            self.assertEqual(
+                set(copied), {p for p in tempdir.rglob("*") if p.is_file()}
+            )
+
+    def test_copy_static_workers(self):
+        with override_settings(STATICSITE_COPY_WORKERS="invalid"):
+            self.assertGreaterEqual(get_copy_workers(), 1)
+        copied = {}
+        for workers in (1, 4):
+            with override_settings(STATICSITE_COPY_WORKERS=workers):
+                self.assertEqual(get_copy_workers(), workers)
+                with TemporaryDirectory() as tempdir:
+                    copied[workers] = {
+                        (Path(f), Path(t).relative_to(tempdir))
+                        for f, t in copy_static(settings.STATIC_ROOT, tempdir)
+                    }
+                    for file_from, file_to in copied[workers]:
+                        self.assertEqual(
+                            (Path(tempdir) / file_to).read_bytes(),
+                            file_from.read_bytes(),
+                        )
+        self.assertTrue(copied[1])
+        self.assertEqual(copied[1], copied[4])
+        # A missing source directory has nothing to copy
+        with TemporaryDirectory() as tempdir:
+            missing = Path(tempdir) / "missing"
+            self.assertEqual(list(copy_static(missing, Path(tempdir) / "out")), [])
+
+    def test_copy_file(self):
+        with TemporaryDirectory() as tempdir:
+            for name, contents in (
+                ("empty.txt", b""),
+                ("large.bin", os.urandom(300000)),
+            ):
+                from_path = Path(tempdir) / name
+                from_path.write_bytes(contents)
+                os.utime(from_path, (1000000000, 1000000000))
+                to_path = Path(tempdir) / f"copy-{name}"
+                copy_file(from_path, to_path)
+                self.assertEqual(to_path.read_bytes(), contents)
+                self.assertEqual(to_path.stat().st_mtime, 1000000000)
+            # Copying onto a hard link of the source must not truncate the source
+            from_path = Path(tempdir) / "linked.txt"
+            from_path.write_bytes(b"test")
+            to_path = Path(tempdir) / "link-linked.txt"
+            os.link(from_path, to_path)
+            with self.assertRaises(SameFileError):
+                copy_file(from_path, to_path)
+            self.assertEqual(from_path.read_bytes(), b"test")
+
+    def test_link_file(self):
+        with TemporaryDirectory() as tempdir:
+            from_path = Path(tempdir) / "from.txt"
+            from_path.write_bytes(b"test")
+            to_path = Path(tempdir) / "to.txt"
+            to_path.write_bytes(b"old")
+            # An existing destination file is replaced by the link
+            link_file(from_path, to_path)
+            self.assertEqual(to_path.read_bytes(), b"test")
+            self.assertTrue(os.path.samefile(from_path, to_path))
+
+    @override_settings(STATICSITE_LINK_STATIC=True)
+    def test_copy_static_link(self):
+        with TemporaryDirectory() as tempdir:
+            copied = list(copy_static(settings.STATIC_ROOT, tempdir))
+            self.assertTrue(copied)
+            for file_from, file_to in copied:
+                self.assertTrue(os.path.samefile(file_from, file_to))
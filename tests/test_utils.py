@@ -0,0 +1,41 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from django.test import TestCase, override_settings
+from staticsite.utils import (
+    chunked,
+    fast_rmtree,
+    fast_temporary_directory,
+    get_langs,
+)
+
+
+class StaticSiteUtilsTestSuite(TestCase):
+    def test_fast_rmtree(self):
+        with TemporaryDirectory() as tempdir:
+            tree = Path(tempdir) / "tree"
+            for i in range(3):
+                subdir = tree / f"dir{i}"
+                subdir.mkdir(parents=True)
+                (subdir / "test.txt").write_bytes(b"test")
+            fast_rmtree(tree)
+            self.assertFalse(tree.exists())
+            self.assertTrue(Path(tempdir).is_dir())
+
+    def test_fast_temporary_directory(self):
+        with fast_temporary_directory() as tempdir:
+            self.assertTrue(tempdir.is_dir())
+            (tempdir / "dir").mkdir()
+            (tempdir / "dir" / "test.txt").write_bytes(b"test")
+        self.assertFalse(tempdir.exists())
+
+    @override_settings(LANGUAGE_CODE="en", STATICSITE_LANGUAGES=["fr", "de"])
+    def test_get_langs(self):
+        self.assertEqual(get_langs(), ("de", "en", "fr"))
+        # The cached languages are cleared when the settings change
+        with override_settings(STATICSITE_LANGUAGES=["en"]):
+            self.assertEqual(get_langs(), ("en",))
+        self.assertEqual(get_langs(), ("de", "en", "fr"))
+
+    def test_chunked(self):
+        self.assertEqual(list(chunked(range(5), 2)), [(0, 1), (2, 3), (4,)])
+        self.assertEqual(list(chunked(iter([]), 2)), [])